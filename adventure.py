@@ -2,7 +2,17 @@
 Source code from: https://2018.galacticpuzzlehunt.com/static/puzzle_resources/adventure/adventure.py
 """
 
+import functools
+import itertools
+import operator
+import random
 import string
+import time
+from collections import namedtuple
+from collections.abc import Mapping
+
+from output import BufferSink, NullSink
+from read_cache import Recording
 
 DEBUG = False
 
@@ -89,23 +99,448 @@ ADVICE = {
 MESSAGE = "TYPESAMETHINGBOTHKEYBOARDS"
 LETTERS = {c: m for c, m in zip(string.ascii_uppercase, MESSAGE)}
 
+# The interpreter refers to rooms by their index in ROOMS. NEIGHBOR_IDS[room * 6 + direction]
+# is the index of the neighbor in that direction, or -1 if there is a wall, and
+# PRESS_LETTERS[room] is what pressing the button in a room adds to log2.
+ROOM_IDS = {room: i for i, room in enumerate(ROOMS)}
+NEIGHBOR_IDS = tuple(
+    -1 if neighbor is None else ROOM_IDS[neighbor] for room in ROOMS for neighbor in NEIGHBORS[room]
+)
+PRESS_LETTERS = tuple(room.lower() for room in ROOMS)
+# MOVE_TARGETS[direction][room] is where moving from a room leads, staying put at a wall
+MOVE_TARGETS = tuple(
+    tuple(
+        room if NEIGHBOR_IDS[room * 6 + direction] < 0 else NEIGHBOR_IDS[room * 6 + direction]
+        for room in range(len(ROOMS))
+    )
+    for direction in range(6)
+)
+ROOM_LETTERS = tuple(LETTERS[room] for room in ROOMS)
+
 MAX_COMMANDS = 1000000
 MAX_BLACKBOARD_LENGTH = 50000
 MAX_DEPTH = 1000
 
+# How many commands a time-limited slice runs between looks at the clock
+TIME_CHECK_INTERVAL = 1000
+
 ROOM_DESCRIPTION = (
     "You are in a large square room with a giant letter {} engraved in the floor."
     " In the middle of the room there is a blackboard."
     " Next to the blackboard is a small button."
 )
 
+(
+    OP_MOVE,
+    OP_PRESS,
+    OP_READ,
+    OP_WRITE,
+    OP_APPEND,
+    OP_ERASE,
+    OP_IF_EMPTY,
+    OP_IF_NOT_EMPTY,
+    OP_LOG1,
+    OP_LOG2,
+    OP_QUIT,
+    OP_VERBOSE,
+    OP_BAD_DIRECTION,
+    OP_NO_DIRECTION,
+    OP_INVALID,
+) = range(15)
+OP_NAMES = (
+    "move",
+    "press",
+    "read",
+    "write",
+    "append",
+    "erase",
+    "if_empty",
+    "if_not_empty",
+    "log1",
+    "log2",
+    "quit",
+    "verbose",
+    "bad_direction",
+    "no_direction",
+    "invalid",
+)
+
+COMMAND_OPS = {
+    "p": OP_PRESS,
+    "r": OP_READ,
+    "t": OP_WRITE,
+    "a": OP_APPEND,
+    "d": OP_ERASE,
+    "i": OP_IF_EMPTY,
+    "j": OP_IF_NOT_EMPTY,
+    "l": OP_LOG1,
+    "k": OP_LOG2,
+    "q": OP_QUIT,
+    "v": OP_VERBOSE,
+}
+
+# Opcodes after which the rest of the line is never executed
+FINAL_OPS = {OP_WRITE, OP_APPEND, OP_QUIT, OP_BAD_DIRECTION, OP_NO_DIRECTION, OP_INVALID}
+
+# Opcodes that, while reading a blackboard with verbose off, can only move the player and
+# press buttons
+PURE_OPS = {OP_MOVE, OP_PRESS, OP_READ, OP_LOG1, OP_LOG2, OP_BAD_DIRECTION, OP_NO_DIRECTION}
+
+# The effect of silently executing a pure program from a given room. `deps` maps the rooms
+# whose blackboards were read to their versions. `room` is None if the program can't be
+# summarized from that room, because it reads a blackboard that isn't pure, reads itself
+# or takes more than MAX_COMMANDS commands.
+Transition = namedtuple("Transition", ["room", "letters", "num_commands", "height", "deps"])
+
+# Everything GameState.restore needs to go back to a point between commands
+Snapshot = namedtuple(
+    "Snapshot",
+    [
+        "room",
+        "log1",
+        "log2_match",
+        "log2_extra",
+        "boards",
+        "running",
+        "won",
+        "num_commands",
+        "verbose",
+        "log1_hash",
+        "log1_hashed",
+    ],
+)
+
+
+class Program:
+    """
+    A command line compiled into one opcode per command.
+
+    `args[i]` is the operand of `ops[i]`: the direction index for a move, or the offset in
+    `text` where the written text (or the invalid direction) starts. `runs[i]` is how
+    many times the move or press at `ops[i]` repeats from there on. Programs made of
+    PURE_OPS cache a Transition for each starting room in `transitions`.
+    """
+
+    __slots__ = ("text", "ops", "args", "runs", "pure", "transitions")
+
+    def __init__(self, text, ops, args):
+        self.text = text
+        self.ops = ops
+        self.args = args
+
+        runs = [1] * len(ops)
+        for i in range(len(ops) - 2, -1, -1):
+            if ops[i] == ops[i + 1] == OP_PRESS or (
+                ops[i] == ops[i + 1] == OP_MOVE and args[i] == args[i + 1]
+            ):
+                runs[i] = runs[i + 1] + 1
+        self.runs = tuple(runs)
+        self.pure = all(op in PURE_OPS for op in ops)
+        self.transitions = {}
+
+    def __len__(self):
+        return len(self.ops)
+
+
+# Lowercases ASCII letters and deletes every other ASCII character
+ASCII_LETTERS = str.maketrans(
+    {chr(c): chr(c).lower() if chr(c).isalpha() else None for c in range(128)}
+)
+
+
+def normalize_command(command):
+    # Lowercases the command and keeps only its lowercase letters
+    if command.isascii():
+        return command.translate(ASCII_LETTERS)
+    return "".join([c for c in command.lower() if c.islower()])
+
+
+# Only lines up to this long share their programs through compile_program's cache. Longer
+# ones are mostly blackboards, which keep their own program, and a program holds a few
+# objects per command, so caching them would pin a lot of memory for every game.
+MAX_CACHED_LINE_LENGTH = 256
+
+
+def compile_program(line):
+    if len(line) > MAX_CACHED_LINE_LENGTH:
+        return compile_line(line)
+    return compile_cached_line(line)
+
+
+def compile_line(line):
+    ops = bytearray()
+    args = []
+    pos = 0
+    end = len(line)
+    while pos < end:
+        cmd = line[pos]
+        pos += 1
+        if cmd in "news":
+            direction = cmd
+            if direction in "ns":
+                if pos == end:
+                    ops.append(OP_NO_DIRECTION)
+                    args.append(0)
+                    break
+                direction += line[pos]
+                pos += 1
+
+            if direction in DIRECTIONS:
+                ops.append(OP_MOVE)
+                args.append(DIRECTIONS[direction])
+            else:
+                ops.append(OP_BAD_DIRECTION)
+                args.append(pos - 2)
+        else:
+            ops.append(COMMAND_OPS.get(cmd, OP_INVALID))
+            args.append(pos)
+
+        if ops[-1] in FINAL_OPS:
+            break
+
+    return Program(line, bytes(ops), tuple(args))
+
+
+compile_cached_line = functools.lru_cache(maxsize=256)(compile_line)
+
+
+# Every edit gives a blackboard a version that no other board state has had
+BOARD_VERSIONS = itertools.count()
+
+# Texts hash as polynomials in HASH_BASE with one term per character, so that appending
+# and erasing the last letter update a hash without going over the whole text. Game states
+# combine those hashes with a random key for each part. The base and keys are random, but
+# the same in every process.
+HASH_MODULUS = (1 << 61) - 1
+HASH_RANDOM = random.Random("adventure")
+
+
+def random_hash_base():
+    # 2 ** 61 is 1 modulo HASH_MODULUS, so a power of two as the base would give the
+    # characters weights that repeat every 61 places, and swapping two letters 61 apart
+    # wouldn't change the hash
+    while True:
+        base = HASH_RANDOM.randrange(2, HASH_MODULUS)
+        if base & (base - 1):
+            return base
+
+
+HASH_BASE = random_hash_base()
+HASH_BASE_INVERSE = pow(HASH_BASE, -1, HASH_MODULUS)
+# Texts are hashed HASH_CHUNK characters at a time, with HASH_POWERS[i] the weight of the
+# character i places from the end of a chunk, and HASH_POWER_SUMS[i] the sum of the
+# weights of a chunk of i characters
+HASH_CHUNK = 1024
+HASH_POWERS = [pow(HASH_BASE, i, HASH_MODULUS) for i in range(HASH_CHUNK + 1)]
+HASH_POWER_SUMS = [sum(HASH_POWERS[:i]) % HASH_MODULUS for i in range(HASH_CHUNK + 1)]
+HASH_KEYS = HASH_RANDOM.choices(range(1, HASH_MODULUS), k=len(ROOMS) * 2 + 3)
+ROOM_HASH_KEYS = HASH_KEYS[: len(ROOMS)]
+BOARD_HASH_KEYS = HASH_KEYS[len(ROOMS) : len(ROOMS) * 2]
+LOG1_HASH_KEY, LOG2_MATCH_HASH_KEY, LOG2_EXTRA_HASH_KEY = HASH_KEYS[len(ROOMS) * 2 :]
+
+
+def text_hash(text):
+    return extend_hash(0, text)
+
+
+def extend_hash(hash, text):
+    # The hash of a text with `hash` followed by `text`. Characters count as their code
+    # point plus one, so that a leading "\0" still changes the hash.
+    for start in range(0, len(text), HASH_CHUNK):
+        chunk = text[start : start + HASH_CHUNK]
+        size = len(chunk)
+        codes = sum(map(operator.mul, map(ord, chunk), HASH_POWERS[size - 1 :: -1]))
+        hash = (hash * HASH_POWERS[size] + codes + HASH_POWER_SUMS[size]) % HASH_MODULUS
+    return hash
+
+
+class Blackboard:
+    """
+    The text on a blackboard, kept in a growable buffer so that appending and erasing the
+    last letter are amortized O(1). The text and its compiled program are built on demand
+    and cached until the next edit.
+
+    A board may be shared between several game states; only the state whose token is its
+    `owner` edits it in place, and the others copy it first. The text_hash of the text is
+    also built on demand, but only over the letters added since it was last asked for.
+    """
+
+    __slots__ = ("data", "version", "owner", "_hash", "_hash_length", "_text", "_program")
+
+    def __init__(self, text=""):
+        self.data = bytearray()
+        self.version = next(BOARD_VERSIONS)
+        self.owner = None
+        self._hash = 0
+        self._hash_length = 0
+        self._text = ""
+        self._program = None
+        if text:
+            self.write(text)
+
+    def __len__(self):
+        return len(self.data)
+
+    def __bool__(self):
+        return len(self.data) > 0
+
+    def __str__(self):
+        return self.text
+
+    def __repr__(self):
+        return f"Blackboard({self.text!r})"
+
+    def __eq__(self, other):
+        if isinstance(other, Blackboard):
+            return self.text == other.text
+        if isinstance(other, str):
+            return self.text == other
+        return NotImplemented
+
+    __hash__ = None
+
+    @property
+    def text(self):
+        if self._text is None:
+            if isinstance(self.data, bytearray):
+                self._text = self.data.decode("latin-1")
+            else:
+                self._text = "".join(self.data)
+        return self._text
+
+    @property
+    def hash(self):
+        if self._hash_length < len(self.data):
+            added = self.data[self._hash_length :]
+            text = added.decode("latin-1") if isinstance(added, bytearray) else "".join(added)
+            self._hash = extend_hash(self._hash, text)
+            self._hash_length = len(self.data)
+        return self._hash
+
+    @property
+    def program(self):
+        if self._program is None:
+            self._program = compile_program(self.text)
+        return self._program
+
+    def copy(self):
+        # The copy has the same text, so it keeps the same version
+        board = Blackboard()
+        board.data = self.data.copy()
+        board.version = self.version
+        board._hash = self._hash
+        board._hash_length = self._hash_length
+        board._text = self._text
+        board._program = self._program
+        return board
+
+    def write(self, text):
+        self.data = bytearray()
+        self._hash = 0
+        self._hash_length = 0
+        self.append(text)
+        self._text = text
+
+    def append(self, text):
+        # Letters outside latin-1 can only be stored one per list item
+        if isinstance(self.data, bytearray):
+            try:
+                self.data += text.encode("latin-1")
+            except UnicodeEncodeError:
+                self.data = list(self.data.decode("latin-1"))
+        if isinstance(self.data, list):
+            self.data.extend(text)
+
+        self.version = next(BOARD_VERSIONS)
+        self._text = None
+        self._program = None
+
+    def erase(self):
+        letter = self.data.pop()
+        if self._hash_length > len(self.data):
+            # Take the letter back out of the hash
+            code = letter if isinstance(letter, int) else ord(letter)
+            self._hash = (self._hash - code - 1) * HASH_BASE_INVERSE % HASH_MODULUS
+            self._hash_length -= 1
+        self.version = next(BOARD_VERSIONS)
+        self._text = None
+        self._program = None
+
+
+# Rooms nobody has written in yet all share this board, which nobody owns
+EMPTY_BOARD = Blackboard()
+
+
+class BlackboardView(Mapping):
+    """
+    The text on the blackboards of a GameState, keyed by room letter, which reads like the
+    dict of strings it replaced. The Blackboard objects themselves are in `state.boards`.
+    """
+
+    __slots__ = ("state",)
+
+    def __init__(self, state):
+        self.state = state
+
+    def __getitem__(self, room):
+        return self.state.boards[ROOM_IDS[room]].text
+
+    def __setitem__(self, room, text):
+        self.state.writable_board(ROOM_IDS[room]).write(str(text))
+
+    def __iter__(self):
+        return iter(ROOMS)
+
+    def __len__(self):
+        return len(ROOMS)
+
 
 class GameState:
-    def __init__(self):
-        self.location = "H"
+    __slots__ = (
+        "room",
+        "log1",
+        "log2_match",
+        "log2_extra",
+        "boards",
+        "running",
+        "won",
+        "num_commands",
+        "depth",
+        "verbose",
+        "output",
+        "frame_programs",
+        "frame_pcs",
+        "frame_recordings",
+        "read_cache",
+        "recording",
+        "token",
+        "changes",
+        "detect_cycles",
+        "frame_keys",
+        "frame_commands",
+        "frame_lines",
+        "frame_peaks",
+        "cycle_starts",
+        "lines_printed",
+        "paused",
+        "pause_at",
+        "deadline",
+        "command_limit",
+        "profiler",
+        "log1_hash",
+        "log1_hashed",
+        "boards_hash",
+        "boards_hashed",
+    )
+
+    def __init__(self, output=None, read_cache=None, detect_cycles=False, profiler=None):
+        self.room = ROOM_IDS["H"]
         self.log1 = ""
-        self.log2 = ""
-        self.blackboards = {key: "" for key in ROOMS}
+        # log2 is always log1[:log2_match] + log2_extra; log2_extra is only non-empty once a
+        # press has gone wrong
+        self.log2_match = 0
+        self.log2_extra = ""
+        self.boards = [EMPTY_BOARD] * len(ROOMS)
         self.running = True
         self.won = False
 
@@ -113,227 +548,968 @@ class GameState:
         self.depth = 0
         self.verbose = DEBUG
 
-        self.current_output = ""
+        self.output = output if output is not None else BufferSink()
+        self.frame_programs = None
+        self.frame_pcs = None
+        self.frame_recordings = None
+
+        # Optional ReadCache, and the Recording for the innermost blackboard being read
+        self.read_cache = read_cache
+        self.recording = None
+
+        # Identifies the blackboards this state may edit in place
+        self.token = object()
+
+        # Counts edits to the blackboards and anything else that can change what a read
+        # does, apart from moving and pressing
+        self.changes = 0
+
+        # Optional detection of reads that nest inside an identical read; see skip_cycle
+        self.detect_cycles = detect_cycles
+        self.frame_keys = None
+        self.frame_commands = None
+        self.frame_lines = None
+        self.frame_peaks = None
+        self.cycle_starts = None
+        # How many lines the game has printed, so that cycles that print aren't skipped
+        self.lines_printed = 0
+
+        # A command that ran out of its slice leaves its (program, pc, base depth) in
+        # `paused`. Slices end after `pause_at` commands or at the `deadline` on the
+        # perf_counter clock. Nothing may take num_commands past `command_limit`, and
+        # run_frames only reads the clock every TIME_CHECK_INTERVAL commands.
+        self.paused = None
+        self.pause_at = None
+        self.deadline = None
+        self.command_limit = MAX_COMMANDS
+
+        # Optional Profiler, told whenever execution moves between blackboards
+        self.profiler = profiler
+
+        # The hash of log1[:log1_hashed]; log1 only grows, so state_hash() only has to hash
+        # what was typed since it last ran. The blackboards' share of the hash is only
+        # summed again once `changes` has moved on from `boards_hashed`.
+        self.log1_hash = 0
+        self.log1_hashed = 0
+        self.boards_hash = 0
+        self.boards_hashed = -1
+
+    @property
+    def location(self):
+        return ROOMS[self.room]
+
+    @location.setter
+    def location(self, room):
+        self.room = ROOM_IDS[room]
+
+    @property
+    def blackboards(self):
+        return BlackboardView(self)
+
+    @property
+    def log2(self):
+        return self.log1[: self.log2_match] + self.log2_extra
+
+    @log2.setter
+    def log2(self, value):
+        match = 0
+        for expected, actual in zip(self.log1, value):
+            if expected != actual:
+                break
+            match += 1
+        self.log2_match = match
+        self.log2_extra = value[match:]
+
+    def is_logging(self):
+        return self.depth == 0 or self.verbose
 
-    def log(self, msg):
+    def log(self, msg, *args):
+        # Formatting is deferred until we know the message will be shown, since the
+        # arguments are often whole blackboards
         if self.depth == 0 or self.verbose:
-            self.print(msg)
+            self.print(msg.format(*args) if args else msg)
 
     def print(self, message):
-        self.current_output += message + "\n"
+        self.lines_printed += 1
+        self.output.write(message)
+        if self.recording is not None:
+            self.recording.lines.append(message)
 
     def reset_current_output(self):
-        self.current_output = ""
+        self.output.reset()
 
     def get_current_output(self):
-        return self.current_output
+        return self.output.getvalue()
+
+    @property
+    def current_output(self):
+        return self.output.getvalue()
 
     def describe_room(self):
         room = self.location
         if DEBUG:
             self.log("Room: " + room)
 
-        self.log(ROOM_DESCRIPTION.format(LETTERS[room]))
+        self.log(ROOM_DESCRIPTION, ROOM_LETTERS[self.room])
         self.log("")
 
-        if self.blackboards[room]:
+        if self.boards[self.room]:
             self.log(
-                f"The blackboard has the following text written on it: {self.blackboards[room]}"
+                "The blackboard has the following text written on it: {}", self.boards[self.room]
             )
         else:
             self.log("The blackboard in this room is empty.")
         self.log("")
 
         if ADVICE[room]:
-            self.log(f'A monkey pops out of the ceiling and says "{ADVICE[room]}"')
+            self.log('A monkey pops out of the ceiling and says "{}"', ADVICE[room])
             self.log("")
 
         exits = [DIRECTION_NAMES[i] for i in range(6) if NEIGHBORS[room][i]]
         exits[-1] = "and " + exits[-1]
-        self.log("There are exits to the {}.".format(", ".join(exits)))
+        self.log("There are exits to the {}.", ", ".join(exits))
+
+    def writable_board(self, room):
+        self.changes += 1
+        board = self.boards[room]
+        if board.owner is not self.token:
+            board = self.boards[room] = board.copy()
+            board.owner = self.token
+        return board
+
+    def check_finished(self):
+        # A paused command's frames and depth aren't part of a snapshot, and a new command
+        # would run on top of them, so it has to be resumed until it finishes first
+        if self.paused is not None:
+            raise RuntimeError("A command is still paused; resume it until it finishes first")
+
+    def snapshot(self):
+        self.check_finished()
+        # Both the snapshot and this state now share every board, so neither may edit them
+        # in place anymore
+        self.token = object()
+        return Snapshot(
+            self.room,
+            self.log1,
+            self.log2_match,
+            self.log2_extra,
+            tuple(self.boards),
+            self.running,
+            self.won,
+            self.num_commands,
+            self.verbose,
+            self.log1_hash,
+            self.log1_hashed,
+        )
+
+    def restore(self, snapshot):
+        self.check_finished()
+        self.room = snapshot.room
+        self.log1 = snapshot.log1
+        self.log2_match = snapshot.log2_match
+        self.log2_extra = snapshot.log2_extra
+        self.boards = list(snapshot.boards)
+        self.running = snapshot.running
+        self.won = snapshot.won
+        self.num_commands = snapshot.num_commands
+        self.verbose = snapshot.verbose
+        self.token = object()
+        self.changes += 1
+        self.log1_hash = snapshot.log1_hash
+        self.log1_hashed = snapshot.log1_hashed
+
+    def fork(self, output=None):
+        # The fork shares this state's read cache, whose entries stay valid for any state
+        state = GameState(output, self.read_cache, self.detect_cycles)
+        state.restore(self.snapshot())
+        return state
+
+    def state_hash(self):
+        """
+        Returns a hash of the room, log1, log2 and every blackboard, which is all that decides
+        how the game can go on. This takes time for the letters typed since the last call
+        (or since the call before the snapshot this state was restored from), but not for
+        the length of the logs or the text on the blackboards.
+        """
+        if self.log1_hashed < len(self.log1):
+            self.log1_hash = extend_hash(self.log1_hash, self.log1[self.log1_hashed :])
+            self.log1_hashed = len(self.log1)
+
+        if self.boards_hashed != self.changes:
+            keys = BOARD_HASH_KEYS
+            self.boards_hash = sum([board.hash * key for board, key in zip(self.boards, keys)])
+            self.boards_hashed = self.changes
+
+        result = ROOM_HASH_KEYS[self.room] + self.log1_hash * LOG1_HASH_KEY + self.boards_hash
+        result += self.log2_match * LOG2_MATCH_HASH_KEY
+        if self.log2_extra:
+            result += text_hash(self.log2_extra) * LOG2_EXTRA_HASH_KEY
+        return result % HASH_MODULUS
 
     def move(self, direction):
-        next_loc = NEIGHBORS[self.location][direction]
-        if next_loc is None:
+        next_room = NEIGHBOR_IDS[self.room * 6 + direction]
+        if next_room < 0:
             self.log("You cannot move in that direction.")
         else:
-            self.location = next_loc
+            self.room = next_room
 
-    def execute(self, line):
+    def move_repeatedly(self, direction, count):
+        room = self.room
+        while count and NEIGHBOR_IDS[room * 6 + direction] >= 0:
+            room = NEIGHBOR_IDS[room * 6 + direction]
+            count -= 1
+        self.room = room
+
+        if self.is_logging():
+            for _ in range(count):
+                self.print("You cannot move in that direction.")
+
+    def execute(self, line, max_commands=None, max_time=None):
+        # Runs at most `max_commands` commands or for `max_time` seconds, and returns
+        # whether the line finished. If it didn't, `resume` picks up where it stopped.
+        self.check_finished()
         if self.depth > MAX_DEPTH:
             self.print(
                 "You are in too deep! The air around you becomes difficult to breathe. You slowly fall unconscious..."
             )
             self.running = False
+            return True
+
+        self.paused = (compile_program(line), 0, self.depth)
+        self.cycle_starts = {} if self.detect_cycles else None
+        if self.profiler is not None:
+            self.profiler.start(line)
+        return self.resume(max_commands, max_time)
+
+    def resume(self, max_commands=None, max_time=None):
+        if self.paused is None:
+            raise RuntimeError("There is no paused command to resume")
+        program, pc, base_depth = self.paused
+        self.paused = None
+        self.pause_at = None if max_commands is None else self.num_commands + max_commands
+        self.deadline = None if max_time is None else time.perf_counter() + max_time
+        finished = True
+        try:
+            finished = self.run_frames(program, pc, base_depth)
+        finally:
+            if self.profiler is not None:
+                self.profiler.stop(self)
+            if finished:
+                while self.depth > base_depth:
+                    self.finish_recording()
+                    self.depth -= 1
+        return finished
+
+    def set_command_limit(self):
+        # Sets how far run_frames can go before it has to starve the player or pause, which
+        # it has to once this is no more than num_commands. Returns how far it can go before
+        # it calls this again, which is sooner if it has to check the clock.
+        limit = MAX_COMMANDS
+        if self.pause_at is not None:
+            limit = min(limit, self.pause_at)
+        if self.deadline is not None and time.perf_counter() >= self.deadline:
+            limit = min(limit, self.num_commands)
+        self.command_limit = limit
+        if self.deadline is not None:
+            return min(limit, self.num_commands + TIME_CHECK_INTERVAL)
+        return limit
+
+    def transition(self, program, room):
+        # Composes the transitions of nested pure reads instead of re-interpreting them.
+        # Each read still being summarized is a [program, start room, pc, room, letters,
+        # commands, height, deps] frame, so deep chains of reads don't recurse.
+        stack = [[program, room, 0, room, [], 0, 0, {}]]
+        while stack:
+            frame = stack[-1]
+            program, start, pc, room, letters, num_commands, height, deps = frame
+            ops = program.ops
+            args = program.args
+            child = None
+            failed = num_commands > MAX_COMMANDS
+            while pc < len(ops) and not failed:
+                op = ops[pc]
+                arg = args[pc]
+                pc += 1
+                num_commands += 1
+                if op == OP_MOVE:
+                    next_room = NEIGHBOR_IDS[room * 6 + arg]
+                    if next_room >= 0:
+                        room = next_room
+                elif op == OP_PRESS:
+                    letters.append(PRESS_LETTERS[room])
+                elif op == OP_READ:
+                    board = self.boards[room]
+                    deps[room] = board.version
+                    if not board:
+                        continue
+                    if not board.program.pure:
+                        failed = True
+                        continue
+
+                    result = self.cached_transition(board.program, room)
+                    if result is None:
+                        if any(f[0] is board.program and f[1] == room for f in stack):
+                            # The read would recurse until it is too deep
+                            failed = True
+                        else:
+                            child = board.program
+                            break
+                    elif result.room is None:
+                        deps.update(result.deps)
+                        failed = True
+                    else:
+                        room = result.room
+                        letters.append(result.letters)
+                        num_commands += result.num_commands
+                        height = max(height, result.height + 1)
+                        deps.update(result.deps)
+                elif op == OP_BAD_DIRECTION:
+                    break
+
+                if num_commands > MAX_COMMANDS:
+                    failed = True
+
+            if failed:
+                # Every read still on the stack depends on the one that failed
+                for frame in reversed(stack):
+                    frame[7].update(deps)
+                    deps = frame[7]
+                    frame[0].transitions[frame[1]] = Transition(None, "", 0, 0, deps)
+                return stack[0][0].transitions[stack[0][1]]
+
+            if child is not None:
+                frame[2:] = [pc, room, letters, num_commands, height, deps]
+                stack.append([child, room, 0, room, [], 0, 0, {}])
+                continue
+
+            result = Transition(room, "".join(letters), num_commands, height, deps)
+            program.transitions[start] = result
+            stack.pop()
+            if stack:
+                parent = stack[-1]
+                parent[3] = result.room
+                parent[4].append(result.letters)
+                parent[5] += result.num_commands
+                parent[6] = max(parent[6], result.height + 1)
+                parent[7].update(deps)
+
+        return result
+
+    def cached_transition(self, program, room):
+        result = program.transitions.get(room)
+        if result is not None:
+            for dep_room, version in result.deps.items():
+                if self.boards[dep_room].version != version:
+                    return None
+        return result
+
+    def all_transitions(self, line):
+        """
+        The Transition of silently executing `line` from each room, keyed by room letter and
+        with the ending room as a letter, or None if `line` isn't pure. Starts that can't be
+        summarized map to None. The 26 starts advance in lockstep through the program's
+        moves and presses, and only split up to read blackboards.
+        """
+        program = compile_program(line)
+        if not program.pure:
+            return None
+
+        starts = range(len(ROOMS))
+        rooms = list(starts)
+        letters = [[] for _ in starts]
+        num_commands = 0
+        extra_commands = [0] * len(ROOMS)
+        heights = [0] * len(ROOMS)
+        deps = [{} for _ in starts]
+        failed = [False] * len(ROOMS)
+        # The rooms of every lane at each press since the last read
+        presses = []
+        for op, arg in zip(program.ops, program.args):
+            num_commands += 1
+            if op == OP_MOVE:
+                targets = MOVE_TARGETS[arg]
+                rooms = [targets[room] for room in rooms]
+            elif op == OP_PRESS:
+                presses.append(tuple(rooms))
+            elif op == OP_READ:
+                self.add_presses(letters, presses)
+                for lane, room in enumerate(rooms):
+                    board = self.boards[room]
+                    deps[lane][room] = board.version
+                    if failed[lane] or not board:
+                        continue
+                    if not board.program.pure:
+                        failed[lane] = True
+                        continue
+
+                    result = self.cached_transition(board.program, room)
+                    if result is None:
+                        result = self.transition(board.program, room)
+                    deps[lane].update(result.deps)
+                    if result.room is None:
+                        failed[lane] = True
+                        continue
+                    rooms[lane] = result.room
+                    letters[lane].append(result.letters)
+                    extra_commands[lane] += result.num_commands
+                    heights[lane] = max(heights[lane], result.height + 1)
+            elif op == OP_BAD_DIRECTION:
+                break
+        self.add_presses(letters, presses)
+
+        transitions = {}
+        for start in starts:
+            if failed[start] or num_commands + extra_commands[start] > MAX_COMMANDS:
+                program.transitions[start] = Transition(None, "", 0, 0, deps[start])
+                transitions[ROOMS[start]] = None
+                continue
+
+            result = Transition(
+                rooms[start],
+                "".join(letters[start]),
+                num_commands + extra_commands[start],
+                heights[start],
+                deps[start],
+            )
+            program.transitions[start] = result
+            transitions[ROOMS[start]] = result._replace(room=ROOMS[result.room])
+        return transitions
+
+    @staticmethod
+    def add_presses(letters, presses):
+        if presses:
+            for lane, rooms in enumerate(zip(*presses)):
+                letters[lane].append("".join(map(PRESS_LETTERS.__getitem__, rooms)))
+            presses.clear()
+
+    def can_apply_transition(self, transition):
+        letters = transition.letters
+        match = self.log2_match
+        return (
+            self.num_commands + transition.num_commands <= self.command_limit
+            and self.depth + 1 + transition.height <= MAX_DEPTH
+            and (
+                not letters
+                or (match + len(letters) < len(self.log1) and self.log1.startswith(letters, match))
+            )
+        )
+
+    def can_apply_summary(self, summary):
+        letters = summary.letters
+        match = self.log2_match
+        return (
+            self.num_commands + summary.num_commands <= self.command_limit
+            and self.depth + 1 + summary.height <= MAX_DEPTH
+            and all(
+                len(self.boards[room]) + len(text) < MAX_BLACKBOARD_LENGTH
+                for room, text in summary.appends.items()
+            )
+            and all(
+                len(self.boards[room]) + bound < MAX_BLACKBOARD_LENGTH
+                for room, bound in summary.bounds.items()
+            )
+            and (
+                not letters
+                or (match + len(letters) < len(self.log1) and self.log1.startswith(letters, match))
+            )
+        )
+
+    def apply_summary(self, summary):
+        self.changes += 1
+        if self.recording is not None:
+            self.recording.merge_summary(summary, self.boards)
+        for line in summary.lines:
+            self.print(line)
+
+        self.room = summary.room
+        self.log2_match += len(summary.letters)
+        self.num_commands += summary.num_commands
+        for room, text in summary.boards.items():
+            self.writable_board(room).write(text)
+        for room, text in summary.appends.items():
+            self.writable_board(room).append(text)
+        self.verbose = summary.verbose
+        self.running = summary.running
+
+    def finish_recording(self):
+        # Called as the frame at self.depth is popped
+        recording = self.recording
+        if self.frame_recordings is None:
             return
 
-        while line:
+        parent = self.frame_recordings[self.depth - 1]
+        if recording is not None:
+            if recording.valid:
+                self.read_cache.put(recording.key, recording.summary(self))
+            if parent is not None:
+                parent.merge_recording(recording)
+        self.recording = parent
+
+    def abandon_recording(self):
+        # The game ended in a way that depends on more than the blackboards (the command
+        # count, the depth or log1), so nothing that was being recorded can be reused
+        if self.recording is not None:
+            self.recording.valid = False
+
+    def skip_cycle(self, start):
+        # The read just entered at self.depth started in the same room, with the same
+        # blackboards, log2 and verbosity as the read entered at `start` that it is nested
+        # in. Everything between the two will repeat, one period deeper each time, until
+        # the game runs out of depth or commands, so copy the frames of as many periods as
+        # are sure to finish and carry on from there. A period that prints anything (even
+        # silent reads print invalid commands) would have to print it every time, so those
+        # aren't skipped.
+        if self.lines_printed != self.frame_lines[start]:
+            return
+
+        depth = self.depth
+        period = depth - start
+        peaks = self.frame_peaks
+        period_commands = self.num_commands - self.frame_commands[start]
+        deepest_read = max(peaks[start:depth])
+        repeats = min(
+            (MAX_DEPTH - 1 - deepest_read) // period,
+            (self.command_limit - self.num_commands) // period_commands,
+        )
+        if repeats <= 0:
+            return
+
+        if self.recording is not None:
+            # The game ends inside this read, so it can't be summarized
+            self.recording.valid = False
+        self.frame_recordings[depth] = self.recording
+        self.recording = None
+
+        for frame in range(depth, depth + repeats * period):
+            source = start + (frame - depth) % period
+            periods = (frame - source) // period
+            self.frame_programs[frame] = self.frame_programs[source]
+            self.frame_pcs[frame] = self.frame_pcs[source]
+            if frame > depth:
+                self.frame_recordings[frame] = None
+            self.frame_keys[frame] = None
+            self.frame_commands[frame] = self.frame_commands[source] + periods * period_commands
+            self.frame_lines[frame] = self.lines_printed
+            peaks[frame] = peaks[source] + periods * period
+
+        self.depth += repeats * period
+        self.num_commands += repeats * period_commands
+        self.frame_keys[self.depth] = None
+        self.frame_commands[self.depth] = self.num_commands
+        self.frame_lines[self.depth] = self.lines_printed
+        peaks[self.depth] = 0
+
+    def run_frames(self, program, pc, base_depth):
+        # Blackboard reads push a (program, pc) frame here instead of recursing, so the
+        # interpreter's stack use does not grow with the read depth. Returns False if the
+        # slice ran out before the frame at base_depth finished.
+        programs = self.frame_programs
+        pcs = self.frame_pcs
+        recordings = self.frame_recordings
+
+        # Fast paths that skip over commands are off while profiling, so that the profiler
+        # can count every command
+        profiler = self.profiler
+        if profiler is not None:
+            profiler.begin(self, program, pc)
+
+        # With cycle detection on, the reads on the stack keyed by the state they started in
+        starts = self.cycle_starts if profiler is None else None
+        if starts is not None:
+            if self.frame_keys is None:
+                self.frame_keys = [None] * (MAX_DEPTH + 1)
+                self.frame_commands = [0] * (MAX_DEPTH + 1)
+                self.frame_lines = [0] * (MAX_DEPTH + 1)
+                self.frame_peaks = [0] * (MAX_DEPTH + 1)
+        keys = self.frame_keys
+        peaks = self.frame_peaks
+
+        limit = self.set_command_limit()
+        ops = program.ops
+        args = program.args
+        runs = program.runs
+        text = program.text
+        while True:
             if not self.running:
-                return
+                return True
 
-            self.num_commands += 1
-            if self.num_commands > MAX_COMMANDS:
-                self.print("You have been wandering around for too long. You die of starvation.")
-                self.running = False
-                return
-
-            cmd = line[0]
-            st = 1
-            if cmd in "news":
-                # move
-                try:
-                    direction = cmd
-                    if direction in "ns":
-                        direction += line[1]
-                        st = 2
-
-                    if direction not in DIRECTIONS:
-                        self.log(f"{direction} is not a valid direction.")
-                        return
-
-                    self.move(DIRECTIONS[direction])
-                except Exception:
-                    self.log("You must specify a valid direction to move in.")
-
-            elif cmd == "p":
-                # press
-                self.log("You press the button.")
-                self.log2 += self.location.lower()
+            if pc == len(ops):
+                if self.depth == base_depth:
+                    return True
+                self.finish_recording()
+                if starts is not None:
+                    depth = self.depth
+                    if peaks[depth] > peaks[depth - 1]:
+                        peaks[depth - 1] = peaks[depth]
+                    if keys[depth] is not None and starts.get(keys[depth]) == depth:
+                        del starts[keys[depth]]
+                self.depth -= 1
+                program = programs[self.depth]
+                ops = program.ops
+                args = program.args
+                runs = program.runs
+                text = program.text
+                pc = pcs[self.depth]
+                if profiler is not None:
+                    profiler.pop(self, program, pc)
+                continue
 
-                if self.log1 == self.log2:
+            if self.num_commands >= limit:
+                if self.num_commands >= MAX_COMMANDS:
+                    self.num_commands += 1
+                    self.print(
+                        "You have been wandering around for too long. You die of starvation."
+                    )
                     self.running = False
-                    self.won = True
-                    return
+                    self.abandon_recording()
+                    return True
+
+                limit = self.set_command_limit()
+                if self.num_commands >= self.command_limit:
+                    self.paused = (program, pc, base_depth)
+                    return False
+
+            self.num_commands += 1
 
-                if not self.log1.startswith(self.log2):
+            op = ops[pc]
+            arg = args[pc]
+            pc += 1
+            if op == OP_MOVE:
+                repeat = runs[pc - 1]
+                if repeat > 1:
+                    # Everything up to the command limit happens at once
+                    repeat = min(repeat, self.command_limit - self.num_commands + 1)
+                    self.num_commands += repeat - 1
+                    pc += repeat - 1
+                    self.move_repeatedly(arg, repeat)
+                else:
+                    self.move(arg)
+            elif op == OP_PRESS:
+                letter = PRESS_LETTERS[self.room]
+                match = self.log2_match
+                repeat = runs[pc - 1]
+                if repeat > 1:
+                    # Press in bulk as long as the presses match log1 without completing it;
+                    # the press that wins or fails (if any) goes through the usual path
+                    repeat = min(repeat, self.command_limit - self.num_commands + 1)
+                    pressed = self.log1[match : min(match + repeat, len(self.log1) - 1)]
+                    repeat = len(pressed) - len(pressed.lstrip(letter))
+                    if repeat > 1:
+                        self.num_commands += repeat - 1
+                        pc += repeat - 1
+                        self.log2_match = match + repeat
+                        if self.is_logging():
+                            for _ in range(repeat):
+                                self.print("You press the button.")
+                        continue
+
+                self.log("You press the button.")
+                if not self.log2_extra and match < len(self.log1) and self.log1[match] == letter:
+                    self.log2_match = match + 1
+                    if match + 1 == len(self.log1):
+                        self.running = False
+                        self.won = True
+                        self.abandon_recording()
+                        return True
+                else:
+                    self.log2_extra += letter
                     self.log(
                         "Uh oh. You feel like pressing that button was a mistake. Everything slowly fades out of existence..."
                     )
 
                     self.running = False
-                    return
-            elif cmd == "t":
-                # write on blackboard
-                self.blackboards[self.location] = line[1:]
-                if len(self.blackboards[self.location]) >= MAX_BLACKBOARD_LENGTH:
-                    self.print(
-                        "While struggling to fit all this text on the blackboard, the blackboard topples over, flattening you."
-                    )
-                    self.running = False
-                    return
-
-                self.log(
-                    f"You write on the blackboard. The blackboard now says: {self.blackboards[self.location]}"
-                )
-                st = len(line)
-            elif cmd == "r":
-                # read from blackboard
-                newcmd = self.blackboards[self.location]
-                if newcmd == "":
+                    self.abandon_recording()
+                    return True
+            elif op == OP_READ:
+                board = self.boards[self.room]
+                if self.recording is not None:
+                    self.recording.read(self.room, board.version)
+                if not board:
                     self.log("The blackboard is empty.")
                 else:
                     self.log(
                         "You read the text on the blackboard. You suddenly feel compelled to obey its instructions..."
                     )
+                    if self.depth >= MAX_DEPTH:
+                        self.print(
+                            "You are in too deep! The air around you becomes difficult to breathe. You slowly fall unconscious..."
+                        )
+                        self.running = False
+                        self.abandon_recording()
+                        return True
+
+                    if not self.verbose and board.program.pure and profiler is None:
+                        result = self.cached_transition(board.program, self.room)
+                        if result is None:
+                            result = self.transition(board.program, self.room)
+                        if result.room is not None and self.can_apply_transition(result):
+                            if self.recording is not None:
+                                self.recording.merge(result.deps, (), {}, {}, {}, result.height)
+                            if starts is not None:
+                                height = self.depth + result.height
+                                peaks[self.depth] = max(peaks[self.depth], height)
+                            self.room = result.room
+                            self.log2_match += len(result.letters)
+                            self.num_commands += result.num_commands
+                            continue
+
+                    recording = None
+                    if self.read_cache is not None and profiler is None:
+                        key = (self.room, board.text, self.verbose)
+                        summary = self.read_cache.get(key, self.boards)
+                        if summary is not None and self.can_apply_summary(summary):
+                            if starts is not None:
+                                height = self.depth + summary.height
+                                peaks[self.depth] = max(peaks[self.depth], height)
+                            self.apply_summary(summary)
+                            continue
+                        recording = Recording(key, self)
+
+                    if programs is None:
+                        programs = self.frame_programs = [None] * (MAX_DEPTH + 1)
+                        pcs = self.frame_pcs = [0] * (MAX_DEPTH + 1)
+                        recordings = self.frame_recordings = [None] * (MAX_DEPTH + 1)
+
+                    programs[self.depth] = program
+                    pcs[self.depth] = pc
+                    recordings[self.depth] = self.recording
+                    self.recording = recording
                     self.depth += 1
-                    self.execute(newcmd)
-                    self.depth -= 1
-            elif cmd == "a":
-                # append to blackboard
-                self.blackboards[self.location] += line[1:]
-                if len(self.blackboards[self.location]) >= MAX_BLACKBOARD_LENGTH:
+                    program = board.program
+                    ops = program.ops
+                    args = program.args
+                    runs = program.runs
+                    text = program.text
+                    pc = 0
+                    if profiler is not None:
+                        profiler.push(self, program)
+
+                    if starts is not None:
+                        depth = self.depth
+                        peaks[depth - 1] = max(peaks[depth - 1], depth - 1)
+                        peaks[depth] = 0
+                        self.frame_commands[depth] = self.num_commands
+                        self.frame_lines[depth] = self.lines_printed
+                        keys[depth] = None
+                        if not self.verbose:
+                            key = (self.room, self.log2_match, self.changes)
+                            start = starts.setdefault(key, depth)
+                            if start == depth:
+                                keys[depth] = key
+                            else:
+                                self.skip_cycle(start)
+            elif op == OP_WRITE:
+                board = self.writable_board(self.room)
+                if self.recording is not None:
+                    self.recording.write(self.room)
+                board.write(text[arg:])
+                if len(board) >= MAX_BLACKBOARD_LENGTH:
+                    self.print(
+                        "While struggling to fit all this text on the blackboard, the blackboard topples over, flattening you."
+                    )
+                    self.running = False
+                    self.abandon_recording()
+                    return True
+
+                self.log("You write on the blackboard. The blackboard now says: {}", board)
+            elif op == OP_APPEND:
+                board = self.writable_board(self.room)
+                if self.recording is not None:
+                    self.recording.append(self.room, board.version, text[arg:])
+                board.append(text[arg:])
+                if len(board) >= MAX_BLACKBOARD_LENGTH:
                     self.print(
                         "While struggling to fit all this text on the blackboard, the blackboard topples over, flattening you."
                     )
                     self.running = False
-                    return
-                self.log(
-                    f"You add some text to the blackboard. The blackboard now says: {self.blackboards[self.location]}"
-                )
-                st = len(line)
-            elif cmd == "d":
-                if self.blackboards[self.location]:
-                    self.blackboards[self.location] = self.blackboards[self.location][:-1]
+                    self.abandon_recording()
+                    return True
+                if self.recording is not None and self.is_logging():
+                    # The message shows the whole board, not just what was appended
+                    self.recording.read(self.room, board.version)
+                self.log("You add some text to the blackboard. The blackboard now says: {}", board)
+            elif op == OP_ERASE:
+                board = self.writable_board(self.room)
+                if self.recording is not None:
+                    self.recording.modify(self.room, board.version)
+                if board:
+                    board.erase()
                     self.log(
-                        f"You erase the last letter from the text on the blackboard. The blackboard now says: {self.blackboards[self.location]}"
+                        "You erase the last letter from the text on the blackboard. The blackboard now says: {}",
+                        board,
                     )
                 else:
                     self.log("The blackboard is empty.")
-            elif cmd == "i":
-                if self.blackboards[self.location]:
-                    return
-            elif cmd == "j":
-                if not self.blackboards[self.location]:
-                    return
-            elif cmd == "l":
-                self.log(self.log1)
-            elif cmd == "k":
-                self.log(self.log2)
-            elif cmd == "q":
+            elif op == OP_IF_EMPTY:
+                board = self.boards[self.room]
+                if self.recording is not None:
+                    self.recording.read(self.room, board.version)
+                if board:
+                    pc = len(ops)
+            elif op == OP_IF_NOT_EMPTY:
+                board = self.boards[self.room]
+                if self.recording is not None:
+                    self.recording.read(self.room, board.version)
+                if not board:
+                    pc = len(ops)
+            elif op == OP_LOG1 or op == OP_LOG2:
+                if self.is_logging():
+                    if self.recording is not None:
+                        # The logs depend on more than the blackboards
+                        self.recording.valid = False
+                    self.print(self.log1 if op == OP_LOG1 else self.log2)
+            elif op == OP_QUIT:
                 self.running = False
-                return
-            elif cmd == "v":
+                return True
+            elif op == OP_VERBOSE:
+                self.changes += 1
                 if self.verbose:
                     self.log("You pay less attention to your actions.")
                     self.verbose = False
                 else:
                     self.log("You pay closer attention to your actions.")
                     self.verbose = True
+            elif op == OP_BAD_DIRECTION:
+                self.log("{} is not a valid direction.", text[arg : arg + 2])
+                pc = len(ops)
+            elif op == OP_NO_DIRECTION:
+                self.log("You must specify a valid direction to move in.")
             else:
                 self.print("Invalid command.")
-                return
+                pc = len(ops)
+
+
+class Continuation:
+    """What is left of a command that ran out of its slice; see AdventureGame.run_command."""
+
+    __slots__ = ("game",)
+
+    def __init__(self, game):
+        self.game = game
 
-            line = line[st:]
+    def resume(self, max_commands=None, max_time=None):
+        return self.game.resume(max_commands, max_time)
 
 
 class AdventureGame:
-    def __init__(self):
-        self.state = GameState()
+    def __init__(self, output=None, read_cache=None, detect_cycles=False, profiler=None):
+        self.state = GameState(output, read_cache, detect_cycles, profiler)
         self.old_location = None
         self.state.describe_room()
 
-    def run_command(self, command):
-        line = "".join([c for c in command.lower() if c.islower()])
+    def run_command(self, command, max_commands=None, max_time=None):
+        """
+        Runs `command`, stopping after `max_commands` commands or `max_time` seconds if
+        either is given. Returns None once the command has finished, or a Continuation to
+        resume it with; the output builds up across the slices. Until the Continuation has
+        finished, running another command or taking a snapshot raises RuntimeError.
+        """
+        self.state.check_finished()
+        line = normalize_command(command)
 
         self.state.reset_current_output()
 
         self.state.log1 += line
         self.old_location = self.state.location
-        self.state.execute(line)
+        if not self.state.execute(line, max_commands, max_time):
+            return Continuation(self)
+        self.finish_command()
 
+    def resume(self, max_commands=None, max_time=None):
+        if not self.state.resume(max_commands, max_time):
+            return Continuation(self)
+        self.finish_command()
+
+    def finish_command(self):
         if self.state.won:
             self.state.print("Congratulations, you played yourself.")
         elif self.state.location != self.old_location:
             self.state.describe_room()
 
+    def run_commands(self, commands, final_only=False):
+        """
+        Runs each of `commands` as run_command would. Returns a generator of each command's
+        output, which runs the commands as it goes, or with `final_only`, runs them all
+        and returns the output of the last one.
+        """
+        if not final_only:
+            return self.iter_outputs(commands)
+
+        state = self.state
+        state.check_finished()
+        output = state.output
+        line = None
+        try:
+            # Only the last command's output is kept, so the others print nowhere and
+            # skip describing the room
+            state.output = NullSink()
+            for command in commands:
+                if line is not None:
+                    state.log1 += line
+                    self.old_location = state.location
+                    state.execute(line)
+                line = normalize_command(command)
+        finally:
+            state.output = output
+
+        if line is not None:
+            self.run_command(line)
+        return self.get_current_output()
+
+    def iter_outputs(self, commands):
+        for command in commands:
+            self.run_command(command)
+            yield self.get_current_output()
+
     def get_current_output(self):
         return self.state.get_current_output()
 
+    def all_transitions(self, command):
+        return self.state.all_transitions(normalize_command(command))
+
+    def snapshot(self):
+        return self.state.snapshot()
+
+    def restore(self, snapshot):
+        self.state.restore(snapshot)
+
+    def state_hash(self):
+        return self.state.state_hash()
+
+    def fork(self, output=None):
+        game = AdventureGame.__new__(AdventureGame)
+        game.state = self.state.fork(output)
+        game.old_location = self.old_location
+        return game
+
+
+# The commands of the solution that main() below plays through
+SAMPLE_SOLUTION = [
+    "a wrwwnwpep",
+    "se",
+    "a pnww a wwwpneppepsee",
+    "enenee",
+    "a pswwwww a seepnwnwwwwpppppepsee",
+    "wwwwww",
+    "a psee a seepnwnwwwwwppeepsee",
+    "w",
+    "a pseee a seepnwnwwwwwpppeepsee",
+    "w",
+    "a pseeee a seepnwnwwwwwppppeepsee",
+    "sw",
+    "a peeee a nwwwwppppeepsee",
+    "e",
+    "a peee a nwwwwpppeepsee",
+    "eee",
+    "wwwwrnwwwwrnwwrnwwwwrnwwwwrseernwwwwrneeeeernwwwrneeeeerwwwrnwwwrwwwwrneeeeerseernwwwwrnwwwwrwwwwrnwwwwrnwwwwrnwwwwrneeeeerseernwwwrneeeeerneeeeernwwwrneeeeerwwwrnwwwrnwwwrnwwwrseernwwwrseernwwwrnwwwrwwwwrneeeeerwwwrnwwwwrnwwwwrnwwwwrnwwwwrnwwwwrwwwwrwwwrnwwwrnwwwrneeeeerseernwwwwrseernwwwwrnwwwwrnwwwwrnwwwwrneeeeerneeeeerneeeeerneeeeerneeeeernwwwrneeeeerwwwrnwwwrnwwwrnwwwwrnwwwwrnwwwwrnwwwwrnwwwwrnwwwwrwwwwrneeeeerwwwrnwwwrnwwwrwwwwrwwwrnwwwrnwwwrneeeeerseernwwwwrseernwwwwrnwwwwrnwwwwrnwwwwrnwwwwrneeeeerneeeeernwwwrnwwwrneeeeerwwwrnwwwrnwwwrnwwwwrwwwwrneeeeerwwwrnwwwrnwwwrnwwwrwwwwrwwwrnwwwrnwwwrneeeeerseernwwwwrseernwwwwrnwwwwrnwwwwrnwwwwrnwwwwrneeeeerneeeeerneeeeernwwwrnwwwrneeeeerwwwrnwwwrnwwwrnwwwwrwwwwrneeeeerwwwrnwwwrnwwwrnwwwrnwwwrwwwwrwwwrnwwwrnwwwrneeeeerseernwwwwrseernwwwwrnwwwwrnwwwwrnwwwwrnwwwwrneeeeerneeeeerneeeeerneeeeernwwwrnwwwrneeeeerwwwrnwwwrnwwwrwwwrnwwwwrwwwwrneeeeernwwwrnwwwrnwwwrnwwwrwwwwrseernwwwwrnwwwwrnwwwwrnwwwwrneeeeerneeeeerneeeeerneeeeernwwwrnwwwrneeeeerwwwrnwwwrnwwwrnwwwrwwwwrneeeeernwwwrnwwwrnwwwrwwwwrseernwwwwrnwwwwrnwwwwrnwwwwrneeeeerneeeeerneeeeernwwwrnwwwrneeeeerwwwrnwwwrnwwwrnwwwrnwwwrnwwwr",
+    "er",
+]
 
 """
 def main():
     game = AdventureGame()
 
-    commands = [
-        'a wrwwnwpep',
-        'se',
-        'a pnww a wwwpneppepsee',
-        'enenee',
-        'a pswwwww a seepnwnwwwwpppppepsee',
-        'wwwwww',
-        'a psee a seepnwnwwwwwppeepsee',
-        'w',
-        'a pseee a seepnwnwwwwwpppeepsee',
-        'w',
-        'a pseeee a seepnwnwwwwwppppeepsee',
-        'sw',
-        'a peeee a nwwwwppppeepsee',
-        'e',
-        'a peee a nwwwwpppeepsee',
-        'eee',
-        'wwwwrnwwwwrnwwrnwwwwrnwwwwrseernwwwwrneeeeernwwwrneeeeerwwwrnwwwrwwwwrneeeeerseernwwwwrnwwwwrwwwwrnwwwwrnwwwwrnwwwwrneeeeerseernwwwrneeeeerneeeeernwwwrneeeeerwwwrnwwwrnwwwrnwwwrseernwwwrseernwwwrnwwwrwwwwrneeeeerwwwrnwwwwrnwwwwrnwwwwrnwwwwrnwwwwrwwwwrwwwrnwwwrnwwwrneeeeerseernwwwwrseernwwwwrnwwwwrnwwwwrnwwwwrneeeeerneeeeerneeeeerneeeeerneeeeernwwwrneeeeerwwwrnwwwrnwwwrnwwwwrnwwwwrnwwwwrnwwwwrnwwwwrnwwwwrwwwwrneeeeerwwwrnwwwrnwwwrwwwwrwwwrnwwwrnwwwrneeeeerseernwwwwrseernwwwwrnwwwwrnwwwwrnwwwwrnwwwwrneeeeerneeeeernwwwrnwwwrneeeeerwwwrnwwwrnwwwrnwwwwrwwwwrneeeeerwwwrnwwwrnwwwrnwwwrwwwwrwwwrnwwwrnwwwrneeeeerseernwwwwrseernwwwwrnwwwwrnwwwwrnwwwwrnwwwwrneeeeerneeeeerneeeeernwwwrnwwwrneeeeerwwwrnwwwrnwwwrnwwwwrwwwwrneeeeerwwwrnwwwrnwwwrnwwwrnwwwrwwwwrwwwrnwwwrnwwwrneeeeerseernwwwwrseernwwwwrnwwwwrnwwwwrnwwwwrnwwwwrneeeeerneeeeerneeeeerneeeeernwwwrnwwwrneeeeerwwwrnwwwrnwwwrwwwrnwwwwrwwwwrneeeeernwwwrnwwwrnwwwrnwwwrwwwwrseernwwwwrnwwwwrnwwwwrnwwwwrneeeeerneeeeerneeeeerneeeeernwwwrnwwwrneeeeerwwwrnwwwrnwwwrnwwwrwwwwrneeeeernwwwrnwwwrnwwwrwwwwrseernwwwwrnwwwwrnwwwwrnwwwwrneeeeerneeeeerneeeeernwwwrnwwwrneeeeerwwwrnwwwrnwwwrnwwwrnwwwrnwwwr',
-        'er',
-    ]
+    commands = SAMPLE_SOLUTION
 
     for command in commands:
         print(game.get_current_output())
@@ -0,0 +1,98 @@
+import argparse
+import functools
+import json
+import os
+import sys
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+
+from adventure import AdventureGame
+from output import BufferSink, NullSink
+
+ScriptResult = namedtuple(
+    "ScriptResult", ["won", "running", "num_commands", "room", "log2_length", "output"]
+)
+
+
+def run_script(script, keep_output=False):
+    """
+    Plays `script` (a list of command lines) in a new game. `output` is the whole transcript
+    when `keep_output` is set, in the same format as the old main(), and None otherwise.
+    """
+    game = AdventureGame(output=BufferSink() if keep_output else NullSink(), detect_cycles=True)
+    transcript = [game.get_current_output()] if keep_output else None
+    for command in script:
+        if keep_output:
+            game.run_command(command)
+            transcript.append("> " + command + "\n" + game.get_current_output())
+        elif game.state.running:
+            game.run_command(command)
+        else:
+            # Nothing but the output changes once the game is over
+            break
+
+    state = game.state
+    return ScriptResult(
+        state.won,
+        state.running,
+        state.num_commands,
+        state.location,
+        state.log2_match + len(state.log2_extra),
+        "\n".join(transcript) if keep_output else None,
+    )
+
+
+def run_many(scripts, workers=None, keep_output=False, chunksize=16):
+    """
+    Yields a ScriptResult for each script, in order, as they finish. The scripts are handed
+    out to `workers` processes (one per core by default) `chunksize` at a time.
+    """
+    run = functools.partial(run_script, keep_output=keep_output)
+    if workers == 1:
+        yield from map(run, scripts)
+        return
+
+    with ProcessPoolExecutor(workers) as executor:
+        yield from executor.map(run, scripts, chunksize=chunksize)
+
+
+def read_scripts(file):
+    # Either a JSON list of scripts, or plain text with one command per line and a blank
+    # line between scripts
+    text = file.read()
+    if text.lstrip().startswith("["):
+        return json.loads(text)
+
+    scripts = [[]]
+    for line in text.splitlines():
+        if line.strip():
+            scripts[-1].append(line)
+        elif scripts[-1]:
+            scripts.append([])
+    return [script for script in scripts if script]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Play many scripts of commands in parallel.")
+    parser.add_argument("file", nargs="?", help="the scripts to play (default: stdin)")
+    parser.add_argument("-w", "--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--chunksize", type=int, default=16)
+    parser.add_argument("--output", action="store_true", help="include each game's transcript")
+    args = parser.parse_args()
+
+    if args.file:
+        with open(args.file) as file:
+            scripts = read_scripts(file)
+    else:
+        scripts = read_scripts(sys.stdin)
+
+    results = run_many(scripts, args.workers, args.output, args.chunksize)
+    for index, result in enumerate(results):
+        row = {"script": index, **result._asdict()}
+        if row["output"] is None:
+            del row["output"]
+        print(json.dumps(row), flush=True)
+
+
+if __name__ == "__main__":
+    main()
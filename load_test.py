@@ -0,0 +1,99 @@
+import argparse
+import asyncio
+import json
+import statistics
+import time
+
+from adventure import SAMPLE_SOLUTION
+from server import PROMPT, GameServer
+
+
+async def read_output(reader):
+    lines = []
+    while True:
+        line = await reader.readline()
+        if not line:
+            raise ConnectionError("The server closed the connection")
+        if line == PROMPT:
+            return b"".join(lines)
+        lines.append(line)
+
+
+async def play(host, port, script, latencies):
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        await read_output(reader)
+        for command in script:
+            start = time.perf_counter()
+            writer.write(command.encode() + b"\n")
+            await writer.drain()
+            await read_output(reader)
+            latencies.append(time.perf_counter() - start)
+    finally:
+        writer.close()
+        await writer.wait_closed()
+
+
+async def run_load(scripts, players, host, port, local):
+    """
+    Connects `players` simulated players at once, each replaying one of `scripts`, and
+    reports their command latencies. With `local`, the server runs on this event loop.
+    """
+    server = None
+    if local:
+        server = await asyncio.start_server(GameServer().handle, host, port)
+        port = server.sockets[0].getsockname()[1]
+
+    latencies = []
+    start = time.perf_counter()
+    cpu_start = time.process_time()
+    try:
+        await asyncio.gather(
+            *(play(host, port, scripts[i % len(scripts)], latencies) for i in range(players))
+        )
+    finally:
+        if server is not None:
+            server.close()
+            await server.wait_closed()
+    elapsed = time.perf_counter() - start
+    cpu_time = time.process_time() - cpu_start
+
+    percentiles = statistics.quantiles(latencies, n=100) if len(latencies) > 1 else latencies * 99
+    report = {
+        "players": players,
+        "commands": len(latencies),
+        "seconds": round(elapsed, 3),
+        "commands_per_second": round(len(latencies) / elapsed, 1),
+        "p50_ms": round(percentiles[49] * 1000, 3),
+        "p99_ms": round(percentiles[98] * 1000, 3),
+        "sessions_per_second": round(players / elapsed, 2),
+    }
+    if local:
+        # The server and the players share this one thread, so this is a lower bound
+        report["sessions_per_core_second"] = round(players / cpu_time, 2)
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay scripts against a game server.")
+    parser.add_argument("scripts", nargs="?", help="a JSON list of scripts (default: the sample)")
+    parser.add_argument("-p", "--players", type=int, default=200)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8023)
+    parser.add_argument(
+        "--local", action="store_true", help="run the server in this process on a free port"
+    )
+    args = parser.parse_args()
+
+    scripts = [SAMPLE_SOLUTION]
+    if args.scripts:
+        with open(args.scripts) as file:
+            scripts = json.load(file)
+
+    port = 0 if args.local else args.port
+    report = asyncio.run(run_load(scripts, args.players, args.host, port, args.local))
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
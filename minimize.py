@@ -0,0 +1,183 @@
+import argparse
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+from adventure import AdventureGame
+from output import NullSink
+from solution import full_script, generate_solution, letters
+
+# Each process keeps snapshots of the game after every prefix of the last script it was
+# given, so that a candidate only replays the commands after its first change
+prefix_script = None
+prefix_game = None
+prefix_snapshots = None
+
+
+def check(script, prefix, rest):
+    """
+    Returns whether playing script[:prefix] followed by `rest` wins.
+    """
+    global prefix_script, prefix_game, prefix_snapshots
+    if script != prefix_script:
+        prefix_script = script
+        prefix_game = AdventureGame(output=NullSink(), detect_cycles=True)
+        prefix_snapshots = [prefix_game.snapshot()]
+
+    game = prefix_game
+    state = game.state
+    while len(prefix_snapshots) <= prefix:
+        game.restore(prefix_snapshots[-1])
+        if state.running:
+            game.run_command(script[len(prefix_snapshots) - 1])
+        prefix_snapshots.append(game.snapshot())
+
+    game.restore(prefix_snapshots[prefix])
+    for command in rest:
+        if not state.running:
+            break
+        game.run_command(command)
+    return state.won
+
+
+def common_prefix(a, b):
+    length = 0
+    while length < min(len(a), len(b)) and a[length] == b[length]:
+        length += 1
+    return length
+
+
+class Verifier:
+    """
+    Checks which candidate scripts win, in `workers` processes (one per core by default),
+    and remembers the answer for every script it has checked.
+    """
+
+    def __init__(self, workers=None):
+        self.executor = None if workers == 1 else ProcessPoolExecutor(workers)
+        self.results = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        if self.executor is not None:
+            self.executor.shutdown(cancel_futures=True)
+
+    def first_win(self, script, candidates):
+        """
+        Returns the index of the first of `candidates` (edits of `script`) that wins, or None.
+        """
+        script = tuple(script)
+        keys = [tuple(candidate) for candidate in candidates]
+        futures = {}
+        if self.executor is not None:
+            for key in keys:
+                if key not in self.results and key not in futures:
+                    prefix = common_prefix(script, key)
+                    futures[key] = self.executor.submit(check, script, prefix, key[prefix:])
+
+        try:
+            for index, key in enumerate(keys):
+                if key in futures:
+                    self.results[key] = futures[key].result()
+                elif key not in self.results:
+                    prefix = common_prefix(script, key)
+                    self.results[key] = check(script, prefix, key[prefix:])
+                if self.results[key]:
+                    return index
+            return None
+        finally:
+            for future in futures.values():
+                future.cancel()
+
+
+def drop(items, start, end):
+    return items[:start] + items[end:]
+
+
+def merge(items, start, end):
+    return items[:start] + [" ".join(items[start:end])] + items[end:]
+
+
+def reduce(items, build, verifier, edit=drop):
+    """
+    Delta debugging: applies `edit` to each of a number of equal chunks of `items`, keeps
+    the first edit whose script (from `build`) still wins, and moves on to smaller chunks
+    whenever none of them do.
+    """
+    granularity = 2
+    while len(items) >= 2:
+        size = -(-len(items) // granularity)
+        edits = [edit(items, start, start + size) for start in range(0, len(items), size)]
+        # Merging a chunk of one item changes nothing
+        edits = [edited for edited in edits if edited != items]
+        index = verifier.first_win(build(items), [build(edited) for edited in edits])
+        if index is not None:
+            items = edits[index]
+            granularity = max(granularity - 1, 2)
+        elif size == 1:
+            break
+        else:
+            granularity = min(granularity * 2, len(items))
+    return items
+
+
+def minimize(script, workers=None):
+    """
+    Returns a version of the winning `script` with fewer commands and letters that still
+    wins. It drops commands, then letters within each command, then merges commands into
+    longer lines.
+    """
+    script = list(script)
+    with Verifier(workers) as verifier:
+        if verifier.first_win(script, [script]) is None:
+            raise ValueError("The script doesn't win")
+
+        script = reduce(script, list, verifier)
+        for i in range(len(script)):
+
+            def build(letters):
+                return [*script[:i], "".join(letters), *script[i + 1 :]]
+
+            letters = [letter for letter in script[i] if not letter.isspace()]
+            reduced = reduce(letters, build, verifier)
+            if len(reduced) < len(letters):
+                script = build(reduced)
+
+        script = reduce(script, list, verifier, merge)
+        # The chunks above always start at a multiple of their size, so try every pair too
+        while True:
+            merges = [merge(script, i, i + 2) for i in range(len(script) - 1)]
+            index = verifier.first_win(script, merges)
+            if index is None:
+                break
+            script = merges[index]
+    return script
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Shrink a winning script.")
+    parser.add_argument(
+        "file", nargs="?", help="a JSON list of commands (default: the generated solution)"
+    )
+    parser.add_argument("-w", "--workers", type=int, default=os.cpu_count())
+    args = parser.parse_args()
+
+    script = full_script(generate_solution())
+    if args.file:
+        with open(args.file) as file:
+            script = json.load(file)
+
+    minimized = minimize(script, args.workers)
+    print(
+        f"{len(script)} commands and {len(letters(script))} letters down to "
+        f"{len(minimized)} commands and {len(letters(minimized))} letters",
+        file=sys.stderr,
+    )
+    print(json.dumps(minimized))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+from collections import Counter
+
+from adventure import ROOMS, AdventureGame
+from routes import ROUTE_LETTERS
+from solution import board_program, full_script, generate_solution, letters
+
+
+def assign_boards(counts, start, hub):
+    """
+    Picks a room for the blackboard of each letter in `counts` (how often step 1 types it)
+    that minimizes the letters typed by step 1 writing the blackboards and by step 2 coming
+    to read them. This runs over the rooms one at a time, keeping the cheapest assignment
+    for every set of letters that has a blackboard so far.
+    """
+    order = sorted(counts)
+    best = {0: (0, {})}
+    for room in ROOMS:
+        if room in (start, hub):
+            continue
+        read = len(ROUTE_LETTERS[hub, room]) + 1
+        costs = [
+            counts[letter] * read + len("".join(board_program(letter, room, hub))) + 1
+            for letter in order
+        ]
+        for mask, (cost, boards) in list(best.items()):
+            for i, letter in enumerate(order):
+                if mask & 1 << i:
+                    continue
+                new_cost = cost + costs[i]
+                new_mask = mask | 1 << i
+                if new_mask not in best or new_cost < best[new_mask][0]:
+                    best[new_mask] = (new_cost, {**boards, letter: room})
+    return best[(1 << len(order)) - 1][1]
+
+
+def typed_letters(solution):
+    return tuple(len(letters(step)) for step in solution[:3])
+
+
+def optimize_solution(start="H"):
+    """
+    Returns the solution that types the fewest letters over every choice of hub, with the
+    blackboards placed by assign_boards. Placing them changes what step 1 types, so this
+    repeats with the new counts until the placement stops changing.
+    """
+    best = None
+    for hub in ROOMS:
+        if hub == start:
+            continue
+        counts = Counter("anprsew")
+        seen = set()
+        while True:
+            boards = assign_boards(counts, start, hub)
+            key = tuple(sorted(boards.items()))
+            if key in seen:
+                break
+            seen.add(key)
+            try:
+                solution = generate_solution(start, hub, boards)
+            except ValueError:
+                # Step 1 typed a letter without a blackboard whose room is taken
+                break
+            if best is None or sum(typed_letters(solution)) < sum(typed_letters(best)):
+                best = solution
+            counts = Counter(letters(solution.step_1))
+    return best
+
+
+def main():
+    baseline = generate_solution()
+    optimized = optimize_solution()
+
+    game = AdventureGame()
+    game.run_commands(full_script(optimized), final_only=True)
+    assert game.state.won
+
+    for step, old, new in zip((1, 2, 3), typed_letters(baseline), typed_letters(optimized)):
+        print(f"Step {step}: {new} letters (was {old}, saves {old - new})")
+    old, new = sum(typed_letters(baseline)), sum(typed_letters(optimized))
+    print(f"Total: {new} letters (was {old}, saves {old - new})")
+    print(f"Commands: {len(full_script(optimized))} (was {len(full_script(baseline))})")
+    boards = ", ".join(f"{letter} in {room}" for letter, room in sorted(optimized.boards.items()))
+    print(f"Hub: {optimized.hub}, blackboards: {boards}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+from abc import ABC, abstractmethod
+from collections import deque
+
+
+class OutputSink(ABC):
+    """
+    Receives the lines a game prints. `getvalue` returns whatever the sink keeps, in the
+    same format as the game's output (one newline after each line).
+    """
+
+    @abstractmethod
+    def write(self, line):
+        pass
+
+    def reset(self):
+        pass
+
+    def getvalue(self):
+        return ""
+
+
+class BufferSink(OutputSink):
+    def __init__(self):
+        self.lines = []
+
+    def write(self, line):
+        self.lines.append(line)
+
+    def reset(self):
+        self.lines = []
+
+    def getvalue(self):
+        return "".join(line + "\n" for line in self.lines)
+
+
+class NullSink(OutputSink):
+    def write(self, line):
+        pass
+
+
+class CallbackSink(OutputSink):
+    """Hands every line to `callback` as soon as it is printed."""
+
+    def __init__(self, callback):
+        self.callback = callback
+
+    def write(self, line):
+        self.callback(line)
+
+
+class RingBufferSink(OutputSink):
+    """Keeps only the last `max_lines` lines."""
+
+    def __init__(self, max_lines):
+        self.lines = deque(maxlen=max_lines)
+
+    def write(self, line):
+        self.lines.append(line)
+
+    def reset(self):
+        self.lines.clear()
+
+    def getvalue(self):
+        return "".join(line + "\n" for line in self.lines)
@@ -0,0 +1,104 @@
+import json
+import time
+from collections import Counter
+
+from adventure import MOVE_TARGETS, OP_MOVE, OP_NAMES, ROOMS
+
+
+class Profiler:
+    """
+    Counts the commands a game runs by opcode, by the room the player was in, by read depth
+    and by the blackboard being executed, and times each blackboard. Pass one to
+    AdventureGame to profile it. The fast paths that skip over commands are off while
+    profiling, so the game runs slower but every command is counted.
+
+    The interpreter only reports where each stretch of a program between two reads
+    starts and ends; the commands in between are counted afterwards from the program.
+    """
+
+    def __init__(self):
+        self.opcodes = Counter()
+        self.rooms = Counter()
+        self.depths = Counter()
+        # (room letter, text) -> [reads, commands, seconds]; command lines have no room
+        self.boards = {}
+        self.stack = []
+        self.segment = None
+
+    def start(self, line):
+        self.stack = [(None, line)]
+        self.boards.setdefault(self.stack[-1], [0, 0, 0.0])[0] += 1
+
+    def begin(self, state, program, pc):
+        start_time = time.perf_counter()
+        self.segment = (program, pc, state.room, state.depth, state.num_commands, start_time)
+
+    def end(self, state):
+        program, pc, room, depth, start_commands, start_time = self.segment
+        elapsed = time.perf_counter() - start_time
+        count = state.num_commands - start_commands
+        for op, arg in zip(program.ops[pc : pc + count], program.args[pc : pc + count]):
+            self.opcodes[op] += 1
+            self.rooms[room] += 1
+            if op == OP_MOVE:
+                room = MOVE_TARGETS[arg][room]
+        self.depths[depth] += count
+
+        board = self.boards[self.stack[-1]]
+        board[1] += count
+        board[2] += elapsed
+        self.segment = None
+
+    def push(self, state, program):
+        self.end(state)
+        self.stack.append((ROOMS[state.room], program.text))
+        self.boards.setdefault(self.stack[-1], [0, 0, 0.0])[0] += 1
+        self.begin(state, program, 0)
+
+    def pop(self, state, program, pc):
+        self.end(state)
+        self.stack.pop()
+        self.begin(state, program, pc)
+
+    def stop(self, state):
+        if self.segment is not None:
+            self.end(state)
+
+    def report(self):
+        boards = sorted(self.boards.items(), key=lambda item: item[1][1], reverse=True)
+        return {
+            "commands": sum(self.opcodes.values()),
+            "seconds": sum(seconds for _, _, seconds in self.boards.values()),
+            "opcodes": {OP_NAMES[op]: count for op, count in self.opcodes.most_common()},
+            "rooms": {ROOMS[room]: count for room, count in self.rooms.most_common()},
+            "depths": {str(depth): count for depth, count in sorted(self.depths.items())},
+            "boards": [
+                {
+                    "room": room,
+                    "text": text,
+                    "reads": reads,
+                    "commands": commands,
+                    "seconds": seconds,
+                }
+                for (room, text), (reads, commands, seconds) in boards
+            ],
+        }
+
+    def to_json(self, **kwargs):
+        return json.dumps(self.report(), **kwargs)
+
+    def summary(self, limit=10):
+        report = self.report()
+        lines = [f"{report['commands']} commands in {report['seconds']:.3f} s"]
+        lines += ["", "By blackboard:"]
+        for board in report["boards"][:limit]:
+            # Command lines are shown after a prompt instead of a room
+            text = board["text"] if len(board["text"]) <= 40 else board["text"][:37] + "..."
+            lines.append(
+                f"  {board['commands']:>9} commands {board['seconds']:>9.4f} s"
+                f" {board['reads']:>7} reads  {board['room'] or '>'} {text}"
+            )
+        for title, counts in (("opcode", "opcodes"), ("room", "rooms"), ("read depth", "depths")):
+            lines += ["", f"By {title}:"]
+            lines += [f"  {count:>9}  {key}" for key, count in list(report[counts].items())[:limit]]
+        return "\n".join(lines)
@@ -0,0 +1,221 @@
+from collections import OrderedDict
+
+
+class ReadSummary:
+    """
+    The net effect of executing a blackboard once: which room it left the player in, which letters
+    it pressed, how many commands it took, what it did to the blackboards, the lines it
+    printed, and whether the game was still running afterwards.
+
+    `deps` maps every room whose blackboard the execution looked at to that board's version
+    at the time; the summary only applies while all of those versions are unchanged. Boards
+    that were only appended to are kept as suffixes in `appends` instead, so they don't
+    depend on what was there before, and `bounds` holds how far boards that were appended
+    to and then overwritten grew first. `height` is how many reads deep the execution went
+    below the blackboard itself.
+    """
+
+    __slots__ = (
+        "deps",
+        "room",
+        "letters",
+        "num_commands",
+        "boards",
+        "appends",
+        "bounds",
+        "lines",
+        "verbose",
+        "running",
+        "height",
+    )
+
+    def __init__(
+        self,
+        deps,
+        room,
+        letters,
+        num_commands,
+        boards,
+        appends,
+        bounds,
+        lines,
+        verbose,
+        running,
+        height,
+    ):
+        self.deps = deps
+        self.room = room
+        self.letters = letters
+        self.num_commands = num_commands
+        self.boards = boards
+        self.appends = appends
+        self.bounds = bounds
+        self.lines = lines
+        self.verbose = verbose
+        self.running = running
+        self.height = height
+
+
+class Recording:
+    """
+    Collects a ReadSummary while a blackboard executes. Every room's blackboard is in at
+    most one of three states: read before being changed (in `deps`, and in `written` once
+    changed), overwritten without being read (only in `written`), or only appended to (in
+    `appended`).
+    """
+
+    __slots__ = (
+        "key",
+        "start_commands",
+        "start_match",
+        "deps",
+        "written",
+        "appended",
+        "first_versions",
+        "bounds",
+        "lines",
+        "height",
+        "valid",
+    )
+
+    def __init__(self, key, state):
+        self.key = key
+        self.start_commands = state.num_commands
+        self.start_match = state.log2_match
+        self.deps = {}
+        self.written = set()
+        self.appended = {}
+        self.first_versions = {}
+        self.bounds = {}
+        self.lines = []
+        self.height = 0
+        self.valid = True
+
+    def read(self, room, version):
+        if room in self.deps or room in self.written:
+            return
+
+        if room in self.appended:
+            del self.appended[room]
+            self.deps[room] = self.first_versions[room]
+            self.written.add(room)
+        else:
+            self.deps[room] = version
+
+    def write(self, room, bound=0):
+        if room in self.deps or room in self.written:
+            self.written.add(room)
+            return
+
+        bound += sum(len(text) for text in self.appended.pop(room, ()))
+        if bound:
+            self.bounds[room] = bound
+        self.written.add(room)
+
+    def append(self, room, version, text):
+        if room in self.deps or room in self.written:
+            self.written.add(room)
+            return
+
+        if room not in self.appended:
+            self.first_versions[room] = version
+            self.appended[room] = []
+        self.appended[room].append(text)
+
+    def modify(self, room, version):
+        self.read(room, version)
+        self.written.add(room)
+
+    def merge(self, deps, written, bounds, appends, first_versions, height):
+        for room, version in deps.items():
+            self.read(room, version)
+        for room in written:
+            if room in deps:
+                self.written.add(room)
+            else:
+                self.write(room, bounds.get(room, 0))
+        for room, text in appends.items():
+            self.append(room, first_versions[room], text)
+        self.height = max(self.height, height + 1)
+
+    def merge_recording(self, recording):
+        appends = {room: "".join(texts) for room, texts in recording.appended.items()}
+        self.merge(
+            recording.deps,
+            recording.written,
+            recording.bounds,
+            appends,
+            recording.first_versions,
+            recording.height,
+        )
+        self.lines.extend(recording.lines)
+        self.valid = self.valid and recording.valid
+
+    def merge_summary(self, summary, blackboards):
+        # Called before the summary is applied; its lines are recorded as they're printed
+        first_versions = {room: blackboards[room].version for room in summary.appends}
+        self.merge(
+            summary.deps,
+            summary.boards,
+            summary.bounds,
+            summary.appends,
+            first_versions,
+            summary.height,
+        )
+
+    def summary(self, state):
+        return ReadSummary(
+            self.deps,
+            state.room,
+            state.log1[self.start_match : state.log2_match],
+            state.num_commands - self.start_commands,
+            {room: state.boards[room].text for room in self.written},
+            {room: "".join(texts) for room, texts in self.appended.items()},
+            self.bounds,
+            self.lines,
+            state.verbose,
+            state.running,
+            self.height,
+        )
+
+
+class ReadCache:
+    """
+    An LRU cache of ReadSummary objects keyed on (room, blackboard text, verbose). Entries
+    whose dependencies have been written to since they were recorded are dropped on lookup.
+    """
+
+    def __init__(self, max_size=1024):
+        self.max_size = max_size
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self.entries)
+
+    def get(self, key, blackboards):
+        summary = self.entries.get(key)
+        if summary is not None:
+            for room, version in summary.deps.items():
+                if blackboards[room].version != version:
+                    del self.entries[key]
+                    summary = None
+                    break
+
+        if summary is None:
+            self.misses += 1
+            return None
+
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return summary
+
+    def put(self, key, summary):
+        self.entries[key] = summary
+        self.entries.move_to_end(key)
+        if len(self.entries) > self.max_size:
+            self.entries.popitem(last=False)
+
+    def clear(self):
+        self.entries.clear()
@@ -0,0 +1,47 @@
+from collections import deque
+
+from adventure import DIRECTIONS, NEIGHBORS, ROOMS
+
+# Routes take their diagonal moves as early as possible
+MOVE_ORDER = ("nw", "ne", "se", "sw", "e", "w")
+
+
+def build_tables():
+    """
+    Returns the number of moves and a shortest list of moves between every pair of rooms,
+    keyed by (start, end).
+    """
+    distances = {}
+    for end in ROOMS:
+        # Moves are reversible, so searching from `end` finds the distance to it
+        distances[end, end] = 0
+        queue = deque([end])
+        while queue:
+            room = queue.popleft()
+            for neighbor in NEIGHBORS[room]:
+                if neighbor is not None and (neighbor, end) not in distances:
+                    distances[neighbor, end] = distances[room, end] + 1
+                    queue.append(neighbor)
+
+    routes = {}
+    for start in ROOMS:
+        for end in ROOMS:
+            moves = []
+            room = start
+            while room != end:
+                for move in MOVE_ORDER:
+                    neighbor = NEIGHBORS[room][DIRECTIONS[move]]
+                    if neighbor is not None and distances[neighbor, end] < distances[room, end]:
+                        moves.append(move)
+                        room = neighbor
+                        break
+            routes[start, end] = tuple(moves)
+    return distances, routes
+
+
+DISTANCES, ROUTES = build_tables()
+
+# What moving along each route types. A shortest route also types the fewest letters on
+# this keyboard: changing rows always takes one diagonal move per row, and any other move
+# is e or w.
+ROUTE_LETTERS = {pair: "".join(moves) for pair, moves in ROUTES.items()}
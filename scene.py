@@ -24,12 +24,44 @@ from keyboard import (
     process_events,
     split_text,
 )
+from solution import full_script, generate_solution, letters
 from text_animations import animate_text_add_letters, animate_text_remove_letters
 
-STEP_1_TEXT = "awrwwnwpepseapnwwawwwpneppepseeeneneeapswwwwwaseepnwnwwwwpppppepseewwwwwwapseeaseepnwnwwwwwppeepseewapseeeaseepnwnwwwwwpppeepseewapseeeeaseepnwnwwwwwppppeepseeswapeeeeanwwwwppppeepseeeapeeeanwwwwpppeepseeeee"
-STEP_2_TEXT = "wwwwrnwwwwrnwwrnwwwwrnwwwwrseernwwwwrneeeeernwwwrneeeeerwwwrnwwwrwwwwrneeeeerseernwwwwrnwwwwrwwwwrnwwwwrnwwwwrnwwwwrneeeeerseernwwwrneeeeerneeeeernwwwrneeeeerwwwrnwwwrnwwwrnwwwrseernwwwrseernwwwrnwwwrwwwwrneeeeerwwwrnwwwwrnwwwwrnwwwwrnwwwwrnwwwwrwwwwrwwwrnwwwrnwwwrneeeeerseernwwwwrseernwwwwrnwwwwrnwwwwrnwwwwrneeeeerneeeeerneeeeerneeeeerneeeeernwwwrneeeeerwwwrnwwwrnwwwrnwwwwrnwwwwrnwwwwrnwwwwrnwwwwrnwwwwrwwwwrneeeeerwwwrnwwwrnwwwrwwwwrwwwrnwwwrnwwwrneeeeerseernwwwwrseernwwwwrnwwwwrnwwwwrnwwwwrnwwwwrneeeeerneeeeernwwwrnwwwrneeeeerwwwrnwwwrnwwwrnwwwwrwwwwrneeeeerwwwrnwwwrnwwwrnwwwrwwwwrwwwrnwwwrnwwwrneeeeerseernwwwwrseernwwwwrnwwwwrnwwwwrnwwwwrnwwwwrneeeeerneeeeerneeeeernwwwrnwwwrneeeeerwwwrnwwwrnwwwrnwwwwrwwwwrneeeeerwwwrnwwwrnwwwrnwwwrnwwwrwwwwrwwwrnwwwrnwwwrneeeeerseernwwwwrseernwwwwrnwwwwrnwwwwrnwwwwrnwwwwrneeeeerneeeeerneeeeerneeeeernwwwrnwwwrneeeeerwwwrnwwwrnwwwrwwwrnwwwwrwwwwrneeeeernwwwrnwwwrnwwwrnwwwrwwwwrseernwwwwrnwwwwrnwwwwrnwwwwrneeeeerneeeeerneeeeerneeeeernwwwrnwwwrneeeeerwwwrnwwwrnwwwrnwwwrwwwwrneeeeernwwwrnwwwrnwwwrwwwwrseernwwwwrnwwwwrnwwwwrnwwwwrneeeeerneeeeerneeeeernwwwrnwwwrneeeeerwwwrnwwwrnwwwrnwwwrnwwwrnwwwr"
+# Step 1 as shown in the video, which routes a couple of moves differently from
+# generate_solution() but writes the same blackboards
+STEP_1_COMMANDS = [
+    "a w r w w nw p e p",
+    "se",
+    "a p nw w a w w w p ne p p e p se e",
+    "e",
+    "ne",
+    "ne",
+    "e",
+    "a p sw w w w w a se e p nw nw w w w p p p p p e p se e",
+    "w",
+    "w",
+    "w",
+    "w",
+    "w",
+    "w",
+    "a p se e a se e p nw nw w w w w p p e e p se e",
+    "w",
+    "a p se e e a se e p nw nw w w w w p p p e e p se e",
+    "w",
+    "a p se e e e a se e p nw nw w w w w p p p p e e p se e",
+    "sw",
+    "a p e e e e a nw w w w p p p p e e p se e",
+    "e",
+    "a p e e e a nw w w w p p p e e p se e",
+    "e",
+    "e",
+    "e",
+]
+SOLUTION = generate_solution(step_1=STEP_1_COMMANDS)
+STEP_1_TEXT = letters(SOLUTION.step_1)
+STEP_2_TEXT = letters(SOLUTION.step_2)
 STEP_3_GAME_TEXT = STEP_2_TEXT.upper()
-G_BLACKBOARD_TEXT = "nw w w w p p p p e e p se e se e p nw nw w w w w p p p p e e p se e se e p nw nw w w w w p p e e p se e se e p nw nw w w w w p p p p e e p se e se e p nw nw w w w w p p p p e e p se e w w w p ne p p e p se e se e p nw nw w w w w p p p p e e p se e se e p nw nw w w w p p p p p e p se e se e p nw nw w w w w p p p e e p se e se e p nw nw w w w p p p p p e p se e nw w w w p p p e e p se e se e p nw nw w w w w p p p e e p se e nw w w w p p p p e e p se e se e p nw nw w w w p p p p p e p se e w w w p ne p p e p se e se e p nw nw w w w w p p p p e e p se e se e p nw nw w w w w p p p p e e p se e nw w w w p p p p e e p se e se e p nw nw w w w w p p p p e e p se e se e p nw nw w w w w p p p p e e p se e se e p nw nw w w w w p p p p e e p se e se e p nw nw w w w p p p p p e p se e w w w p ne p p e p se e se e p nw nw w w w w p p p e e p se e se e p nw nw w w w p p p p p e p se e se e p nw nw w w w p p p p p e p se e se e p nw nw w w w w p p p e e p se e se e p nw nw w w w p p p p p e p se e nw w w w p p p e e p se e se e p nw nw w w w w p p p e e p se e se e p nw nw w w w w p p p e e p se e se e p nw nw w w w w p p p e e p se e w w w p ne p p e p se e se e p nw nw w w w w p p p e e p se e w w w p ne p p e p se e se e p nw nw w w w w p p p e e p se e se e p nw nw w w w w p p p e e p se e nw w w w p p p p e e p se e se e p nw nw w w w p p p p p e p se e nw w w w p p p e e p se e se e p nw nw w w w w p p p p e e p se e se e p nw nw w w w w p p p p e e p se e se e p nw nw w w w w p p p p e e p se e se e p nw nw w w w w p p p p e e p se e se e p nw nw w w w w p p p p e e p se e nw w w w p p p p e e p se e nw w w w p p p e e p se e se e p nw nw w w w w p p p e e p se e se e p nw nw w w w w p p p e e p se e se e p nw nw w w w p p p p p e p se e w w w p ne p p e p se e se e p nw nw w w w w p p p p e e p se e w w w p ne p p e p se e se e p nw nw w w w w p p p p e e p se e se e p nw nw w w w w p p p p e e p se e se e p nw nw w w w w p p p p e e p se e se e p nw nw w w w w p p p p e e p se e se e p nw nw w w w p p p p p e p se e se e p nw nw w w w p p p p p e p se e se e p nw nw w w w p p p p p e p se e se e p nw nw w w w p p p p p e p se e se e p nw nw w w w p p p p p e p se e se e p nw nw w w w w p p p e e p se e se e p nw nw w w w p p p p p e p se e nw w w w p p p e e p se e se e p nw nw w w w w p p p e e p se e se e p nw nw w w w w p p p e e p se e se e p nw nw w w w w p p p p e e p se e se e p nw nw w w w w p p p p e e p se e se e p nw nw w w w w p p p p e e p se e se e p nw nw w w w w p p p p e e p se e se e p nw nw w w w w p p p p e e p se e se e p nw nw w w w w p p p p e e p se e nw w w w p p p p e e p se e se e p nw nw w w w p p p p p e p se e nw w w w p p p e e p se e se e p nw nw w w w w p p p e e p se e se e p nw nw w w w w p p p e e p se e nw w w w p p p p e e p se e nw w w w p p p e e p se e se e p nw nw w w w w p p p e e p se e se e p nw nw w w w w p p p e e p se e se e p nw nw w w w p p p p p e p se e w w w p ne p p e p se e se e p nw nw w w w w p p p p e e p se e w w w p ne p p e p se e se e p nw nw w w w w p p p p e e p se e se e p nw nw w w w w p p p p e e p se e se e p nw nw w w w w p p p p e e p se e se e p nw nw w w w w p p p p e e p se e se e p nw nw w w w w p p p p e e p se e se e p nw nw w w w p p p p p e p se e se e p nw nw w w w p p p p p e p se e se e p nw nw w w w w p p p e e p se e se e p nw nw w w w w p p p e e p se e se e p nw nw w w w p p p p p e p se e nw w w w p p p e e p se e se e p nw nw w w w w p p p e e p se e se e p nw nw w w w w p p p e e p se e se e p nw nw w w w w p p p p e e p se e nw w w w p p p p e e p se e se e p nw nw w w w p p p p p e p se e nw w w w p p p e e p se e se e p nw nw w w w w p p p e e p se e se e p nw nw w w w w p p p e e p se e se e p nw nw w w w w p p p e e p se e nw w w w p p p p e e p se e nw w w w p p p e e p se e se e p nw nw w w w w p p p e e p se e se e p nw nw w w w w p p p e e p se e se e p nw nw w w w p p p p p e p se e w w w p ne p p e p se e se e p nw nw w w w w p p p p e e p se e w w w p ne p p e p se e se e p nw nw w w w w p p p p e e p se e se e p nw nw w w w w p p p p e e p se e se e p nw nw w w w w p p p p e e p se e se e p nw nw w w w w p p p p e e p se e se e p nw nw w w w w p p p p e e p se e se e p nw nw w w w p p p p p e p se e se e p nw nw w w w p p p p p e p se e se e p nw nw w w w p p p p p e p se e se e p nw nw w w w w p p p e e p se e se e p nw nw w w w w p p p e e p se e se e p nw nw w w w p p p p p e p se e nw w w w p p p e e p se e se e p nw nw w w w w p p p e e p se e se e p nw nw w w w w p p p e e p se e se e p nw nw w w w w p p p p e e p se e nw w w w p p p p e e p se e se e p nw nw w w w p p p p p e p se e nw w w w p p p e e p se e se e p nw nw w w w w p p p e e p se e se e p nw nw w w w w p p p e e p se e se e p nw nw w w w w p p p e e p se e se e p nw nw w w w w p p p e e p se e nw w w w p p p p e e p se e nw w w w p p p e e p se e se e p nw nw w w w w p p p e e p se e se e p nw nw w w w w p p p e e p se e se e p nw nw w w w p p p p p e p se e w w w p ne p p e p se e se e p nw nw w w w w p p p p e e p se e w w w p ne p p e p se e se e p nw nw w w w w p p p p e e p se e se e p nw nw w w w w p p p p e e p se e se e p nw nw w w w w p p p p e e p se e se e p nw nw w w w w p p p p e e p se e se e p nw nw w w w w p p p p e e p se e se e p nw nw w w w p p p p p e p se e se e p nw nw w w w p p p p p e p se e se e p nw nw w w w p p p p p e p se e se e p nw nw w w w p p p p p e p se e se e p nw nw w w w w p p p e e p se e se e p nw nw w w w w p p p e e p se e se e p nw nw w w w p p p p p e p se e nw w w w p p p e e p se e se e p nw nw w w w w p p p e e p se e se e p nw nw w w w w p p p e e p se e nw w w w p p p e e p se e se e p nw nw w w w w p p p p e e p se e nw w w w p p p p e e p se e se e p nw nw w w w p p p p p e p se e se e p nw nw w w w w p p p e e p se e se e p nw nw w w w w p p p e e p se e se e p nw nw w w w w p p p e e p se e se e p nw nw w w w w p p p e e p se e nw w w w p p p p e e p se e w w w p ne p p e p se e se e p nw nw w w w w p p p p e e p se e se e p nw nw w w w w p p p p e e p se e se e p nw nw w w w w p p p p e e p se e se e p nw nw w w w w p p p p e e p se e se e p nw nw w w w p p p p p e p se e se e p nw nw w w w p p p p p e p se e se e p nw nw w w w p p p p p e p se e se e p nw nw w w w p p p p p e p se e se e p nw nw w w w w p p p e e p se e se e p nw nw w w w w p p p e e p se e se e p nw nw w w w p p p p p e p se e nw w w w p p p e e p se e se e p nw nw w w w w p p p e e p se e se e p nw nw w w w w p p p e e p se e se e p nw nw w w w w p p p e e p se e nw w w w p p p p e e p se e se e p nw nw w w w p p p p p e p se e se e p nw nw w w w w p p p e e p se e se e p nw nw w w w w p p p e e p se e se e p nw nw w w w w p p p e e p se e nw w w w p p p p e e p se e w w w p ne p p e p se e se e p nw nw w w w w p p p p e e p se e se e p nw nw w w w w p p p p e e p se e se e p nw nw w w w w p p p p e e p se e se e p nw nw w w w w p p p p e e p se e se e p nw nw w w w p p p p p e p se e se e p nw nw w w w p p p p p e p se e se e p nw nw w w w p p p p p e p se e se e p nw nw w w w w p p p e e p se e se e p nw nw w w w w p p p e e p se e se e p nw nw w w w p p p p p e p se e nw w w w p p p e e p se e se e p nw nw w w w w p p p e e p se e se e p nw nw w w w w p p p e e p se e se e p nw nw w w w w p p p e e p se e se e p nw nw w w w w p p p e e p se e se e p nw nw w w w w p p p e e p se e"
+G_BLACKBOARD_TEXT = SOLUTION.hub_board
 
 
 class AdventureScene(Scene):
@@ -2479,1005 +2511,7 @@ class AllCommands(AdventureScene):
 
         self.pause(1)
         # 997 total commands
-        all_commands = [
-            "a w r w w nw p e p",
-            "se",
-            "a p nw w a w w w p ne p p e p se e",
-            "e",
-            "ne",
-            "ne",
-            "e",
-            "a p sw w w w w a se e p nw nw w w w p p p p p e p se e",
-            "w",
-            "w",
-            "w",
-            "w",
-            "w",
-            "w",
-            "a p se e a se e p nw nw w w w w p p e e p se e",
-            "w",
-            "a p se e e a se e p nw nw w w w w p p p e e p se e",
-            "w",
-            "a p se e e e a se e p nw nw w w w w p p p p e e p se e",
-            "sw",
-            "a p e e e e a nw w w w p p p p e e p se e",
-            "e",
-            "a p e e e a nw w w w p p p e e p se e",
-            "e",
-            "e",
-            "e",
-            "w",
-            "w",
-            "w",
-            "w",
-            "r",
-            "nw",
-            "w",
-            "w",
-            "w",
-            "r",
-            "nw",
-            "w",
-            "r",
-            "nw",
-            "w",
-            "w",
-            "w",
-            "r",
-            "nw",
-            "w",
-            "w",
-            "w",
-            "r",
-            "se",
-            "e",
-            "r",
-            "nw",
-            "w",
-            "w",
-            "w",
-            "r",
-            "ne",
-            "e",
-            "e",
-            "e",
-            "e",
-            "r",
-            "nw",
-            "w",
-            "w",
-            "r",
-            "ne",
-            "e",
-            "e",
-            "e",
-            "e",
-            "r",
-            "w",
-            "w",
-            "w",
-            "r",
-            "nw",
-            "w",
-            "w",
-            "r",
-            "w",
-            "w",
-            "w",
-            "w",
-            "r",
-            "ne",
-            "e",
-            "e",
-            "e",
-            "e",
-            "r",
-            "se",
-            "e",
-            "r",
-            "nw",
-            "w",
-            "w",
-            "w",
-            "r",
-            "nw",
-            "w",
-            "w",
-            "w",
-            "r",
-            "w",
-            "w",
-            "w",
-            "w",
-            "r",
-            "nw",
-            "w",
-            "w",
-            "w",
-            "r",
-            "nw",
-            "w",
-            "w",
-            "w",
-            "r",
-            "nw",
-            "w",
-            "w",
-            "w",
-            "r",
-            "ne",
-            "e",
-            "e",
-            "e",
-            "e",
-            "r",
-            "se",
-            "e",
-            "r",
-            "nw",
-            "w",
-            "w",
-            "r",
-            "ne",
-            "e",
-            "e",
-            "e",
-            "e",
-            "r",
-            "ne",
-            "e",
-            "e",
-            "e",
-            "e",
-            "r",
-            "nw",
-            "w",
-            "w",
-            "r",
-            "ne",
-            "e",
-            "e",
-            "e",
-            "e",
-            "r",
-            "w",
-            "w",
-            "w",
-            "r",
-            "nw",
-            "w",
-            "w",
-            "r",
-            "nw",
-            "w",
-            "w",
-            "r",
-            "nw",
-            "w",
-            "w",
-            "r",
-            "se",
-            "e",
-            "r",
-            "nw",
-            "w",
-            "w",
-            "r",
-            "se",
-            "e",
-            "r",
-            "nw",
-            "w",
-            "w",
-            "r",
-            "nw",
-            "w",
-            "w",
-            "r",
-            "w",
-            "w",
-            "w",
-            "w",
-            "r",
-            "ne",
-            "e",
-            "e",
-            "e",
-            "e",
-            "r",
-            "w",
-            "w",
-            "w",
-            "r",
-            "nw",
-            "w",
-            "w",
-            "w",
-            "r",
-            "nw",
-            "w",
-            "w",
-            "w",
-            "r",
-            "nw",
-            "w",
-            "w",
-            "w",
-            "r",
-            "nw",
-            "w",
-            "w",
-            "w",
-            "r",
-            "nw",
-            "w",
-            "w",
-            "w",
-            "r",
-            "w",
-            "w",
-            "w",
-            "w",
-            "r",
-            "w",
-            "w",
-            "w",
-            "r",
-            "nw",
-            "w",
-            "w",
-            "r",
-            "nw",
-            "w",
-            "w",
-            "r",
-            "ne",
-            "e",
-            "e",
-            "e",
-            "e",
-            "r",
-            "se",
-            "e",
-            "r",
-            "nw",
-            "w",
-            "w",
-            "w",
-            "r",
-            "se",
-            "e",
-            "r",
-            "nw",
-            "w",
-            "w",
-            "w",
-            "r",
-            "nw",
-            "w",
-            "w",
-            "w",
-            "r",
-            "nw",
-            "w",
-            "w",
-            "w",
-            "r",
-            "nw",
-            "w",
-            "w",
-            "w",
-            "r",
-            "ne",
-            "e",
-            "e",
-            "e",
-            "e",
-            "r",
-            "ne",
-            "e",
-            "e",
-            "e",
-            "e",
-            "r",
-            "ne",
-            "e",
-            "e",
-            "e",
-            "e",
-            "r",
-            "ne",
-            "e",
-            "e",
-            "e",
-            "e",
-            "r",
-            "ne",
-            "e",
-            "e",
-            "e",
-            "e",
-            "r",
-            "nw",
-            "w",
-            "w",
-            "r",
-            "ne",
-            "e",
-            "e",
-            "e",
-            "e",
-            "r",
-            "w",
-            "w",
-            "w",
-            "r",
-            "nw",
-            "w",
-            "w",
-            "r",
-            "nw",
-            "w",
-            "w",
-            "r",
-            "nw",
-            "w",
-            "w",
-            "w",
-            "r",
-            "nw",
-            "w",
-            "w",
-            "w",
-            "r",
-            "nw",
-            "w",
-            "w",
-            "w",
-            "r",
-            "nw",
-            "w",
-            "w",
-            "w",
-            "r",
-            "nw",
-            "w",
-            "w",
-            "w",
-            "r",
-            "nw",
-            "w",
-            "w",
-            "w",
-            "r",
-            "w",
-            "w",
-            "w",
-            "w",
-            "r",
-            "ne",
-            "e",
-            "e",
-            "e",
-            "e",
-            "r",
-            "w",
-            "w",
-            "w",
-            "r",
-            "nw",
-            "w",
-            "w",
-            "r",
-            "nw",
-            "w",
-            "w",
-            "r",
-            "w",
-            "w",
-            "w",
-            "w",
-            "r",
-            "w",
-            "w",
-            "w",
-            "r",
-            "nw",
-            "w",
-            "w",
-            "r",
-            "nw",
-            "w",
-            "w",
-            "r",
-            "ne",
-            "e",
-            "e",
-            "e",
-            "e",
-            "r",
-            "se",
-            "e",
-            "r",
-            "nw",
-            "w",
-            "w",
-            "w",
-            "r",
-            "se",
-            "e",
-            "r",
-            "nw",
-            "w",
-            "w",
-            "w",
-            "r",
-            "nw",
-            "w",
-            "w",
-            "w",
-            "r",
-            "nw",
-            "w",
-            "w",
-            "w",
-            "r",
-            "nw",
-            "w",
-            "w",
-            "w",
-            "r",
-            "nw",
-            "w",
-            "w",
-            "w",
-            "r",
-            "ne",
-            "e",
-            "e",
-            "e",
-            "e",
-            "r",
-            "ne",
-            "e",
-            "e",
-            "e",
-            "e",
-            "r",
-            "nw",
-            "w",
-            "w",
-            "r",
-            "nw",
-            "w",
-            "w",
-            "r",
-            "ne",
-            "e",
-            "e",
-            "e",
-            "e",
-            "r",
-            "w",
-            "w",
-            "w",
-            "r",
-            "nw",
-            "w",
-            "w",
-            "r",
-            "nw",
-            "w",
-            "w",
-            "r",
-            "nw",
-            "w",
-            "w",
-            "w",
-            "r",
-            "w",
-            "w",
-            "w",
-            "w",
-            "r",
-            "ne",
-            "e",
-            "e",
-            "e",
-            "e",
-            "r",
-            "w",
-            "w",
-            "w",
-            "r",
-            "nw",
-            "w",
-            "w",
-            "r",
-            "nw",
-            "w",
-            "w",
-            "r",
-            "nw",
-            "w",
-            "w",
-            "r",
-            "w",
-            "w",
-            "w",
-            "w",
-            "r",
-            "w",
-            "w",
-            "w",
-            "r",
-            "nw",
-            "w",
-            "w",
-            "r",
-            "nw",
-            "w",
-            "w",
-            "r",
-            "ne",
-            "e",
-            "e",
-            "e",
-            "e",
-            "r",
-            "se",
-            "e",
-            "r",
-            "nw",
-            "w",
-            "w",
-            "w",
-            "r",
-            "se",
-            "e",
-            "r",
-            "nw",
-            "w",
-            "w",
-            "w",
-            "r",
-            "nw",
-            "w",
-            "w",
-            "w",
-            "r",
-            "nw",
-            "w",
-            "w",
-            "w",
-            "r",
-            "nw",
-            "w",
-            "w",
-            "w",
-            "r",
-            "nw",
-            "w",
-            "w",
-            "w",
-            "r",
-            "ne",
-            "e",
-            "e",
-            "e",
-            "e",
-            "r",
-            "ne",
-            "e",
-            "e",
-            "e",
-            "e",
-            "r",
-            "ne",
-            "e",
-            "e",
-            "e",
-            "e",
-            "r",
-            "nw",
-            "w",
-            "w",
-            "r",
-            "nw",
-            "w",
-            "w",
-            "r",
-            "ne",
-            "e",
-            "e",
-            "e",
-            "e",
-            "r",
-            "w",
-            "w",
-            "w",
-            "r",
-            "nw",
-            "w",
-            "w",
-            "r",
-            "nw",
-            "w",
-            "w",
-            "r",
-            "nw",
-            "w",
-            "w",
-            "w",
-            "r",
-            "w",
-            "w",
-            "w",
-            "w",
-            "r",
-            "ne",
-            "e",
-            "e",
-            "e",
-            "e",
-            "r",
-            "w",
-            "w",
-            "w",
-            "r",
-            "nw",
-            "w",
-            "w",
-            "r",
-            "nw",
-            "w",
-            "w",
-            "r",
-            "nw",
-            "w",
-            "w",
-            "r",
-            "nw",
-            "w",
-            "w",
-            "r",
-            "w",
-            "w",
-            "w",
-            "w",
-            "r",
-            "w",
-            "w",
-            "w",
-            "r",
-            "nw",
-            "w",
-            "w",
-            "r",
-            "nw",
-            "w",
-            "w",
-            "r",
-            "ne",
-            "e",
-            "e",
-            "e",
-            "e",
-            "r",
-            "se",
-            "e",
-            "r",
-            "nw",
-            "w",
-            "w",
-            "w",
-            "r",
-            "se",
-            "e",
-            "r",
-            "nw",
-            "w",
-            "w",
-            "w",
-            "r",
-            "nw",
-            "w",
-            "w",
-            "w",
-            "r",
-            "nw",
-            "w",
-            "w",
-            "w",
-            "r",
-            "nw",
-            "w",
-            "w",
-            "w",
-            "r",
-            "nw",
-            "w",
-            "w",
-            "w",
-            "r",
-            "ne",
-            "e",
-            "e",
-            "e",
-            "e",
-            "r",
-            "ne",
-            "e",
-            "e",
-            "e",
-            "e",
-            "r",
-            "ne",
-            "e",
-            "e",
-            "e",
-            "e",
-            "r",
-            "ne",
-            "e",
-            "e",
-            "e",
-            "e",
-            "r",
-            "nw",
-            "w",
-            "w",
-            "r",
-            "nw",
-            "w",
-            "w",
-            "r",
-            "ne",
-            "e",
-            "e",
-            "e",
-            "e",
-            "r",
-            "w",
-            "w",
-            "w",
-            "r",
-            "nw",
-            "w",
-            "w",
-            "r",
-            "nw",
-            "w",
-            "w",
-            "r",
-            "w",
-            "w",
-            "w",
-            "r",
-            "nw",
-            "w",
-            "w",
-            "w",
-            "r",
-            "w",
-            "w",
-            "w",
-            "w",
-            "r",
-            "ne",
-            "e",
-            "e",
-            "e",
-            "e",
-            "r",
-            "nw",
-            "w",
-            "w",
-            "r",
-            "nw",
-            "w",
-            "w",
-            "r",
-            "nw",
-            "w",
-            "w",
-            "r",
-            "nw",
-            "w",
-            "w",
-            "r",
-            "w",
-            "w",
-            "w",
-            "w",
-            "r",
-            "se",
-            "e",
-            "r",
-            "nw",
-            "w",
-            "w",
-            "w",
-            "r",
-            "nw",
-            "w",
-            "w",
-            "w",
-            "r",
-            "nw",
-            "w",
-            "w",
-            "w",
-            "r",
-            "nw",
-            "w",
-            "w",
-            "w",
-            "r",
-            "ne",
-            "e",
-            "e",
-            "e",
-            "e",
-            "r",
-            "ne",
-            "e",
-            "e",
-            "e",
-            "e",
-            "r",
-            "ne",
-            "e",
-            "e",
-            "e",
-            "e",
-            "r",
-            "ne",
-            "e",
-            "e",
-            "e",
-            "e",
-            "r",
-            "nw",
-            "w",
-            "w",
-            "r",
-            "nw",
-            "w",
-            "w",
-            "r",
-            "ne",
-            "e",
-            "e",
-            "e",
-            "e",
-            "r",
-            "w",
-            "w",
-            "w",
-            "r",
-            "nw",
-            "w",
-            "w",
-            "r",
-            "nw",
-            "w",
-            "w",
-            "r",
-            "nw",
-            "w",
-            "w",
-            "r",
-            "w",
-            "w",
-            "w",
-            "w",
-            "r",
-            "ne",
-            "e",
-            "e",
-            "e",
-            "e",
-            "r",
-            "nw",
-            "w",
-            "w",
-            "r",
-            "nw",
-            "w",
-            "w",
-            "r",
-            "nw",
-            "w",
-            "w",
-            "r",
-            "w",
-            "w",
-            "w",
-            "w",
-            "r",
-            "se",
-            "e",
-            "r",
-            "nw",
-            "w",
-            "w",
-            "w",
-            "r",
-            "nw",
-            "w",
-            "w",
-            "w",
-            "r",
-            "nw",
-            "w",
-            "w",
-            "w",
-            "r",
-            "nw",
-            "w",
-            "w",
-            "w",
-            "r",
-            "ne",
-            "e",
-            "e",
-            "e",
-            "e",
-            "r",
-            "ne",
-            "e",
-            "e",
-            "e",
-            "e",
-            "r",
-            "ne",
-            "e",
-            "e",
-            "e",
-            "e",
-            "r",
-            "nw",
-            "w",
-            "w",
-            "r",
-            "nw",
-            "w",
-            "w",
-            "r",
-            "ne",
-            "e",
-            "e",
-            "e",
-            "e",
-            "r",
-            "w",
-            "w",
-            "w",
-            "r",
-            "nw",
-            "w",
-            "w",
-            "r",
-            "nw",
-            "w",
-            "w",
-            "r",
-            "nw",
-            "w",
-            "w",
-            "r",
-            "nw",
-            "w",
-            "w",
-            "r",
-            "nw",
-            "w",
-            "w",
-            "r",
-            "e",
-            "r",
-        ]
+        all_commands = full_script(SOLUTION)
 
         game = AdventureGame()
         for command in all_commands:
@@ -0,0 +1,106 @@
+import argparse
+import asyncio
+import itertools
+import time
+
+from adventure import AdventureGame
+
+# Ends the output of every command, like the prompt in main()
+PROMPT = b">\n"
+
+
+class Session:
+    __slots__ = ("id", "game", "writer", "address", "last_active")
+
+    def __init__(self, id, writer):
+        self.id = id
+        self.game = AdventureGame(detect_cycles=True)
+        self.writer = writer
+        self.address = writer.get_extra_info("peername")
+        self.last_active = time.monotonic()
+
+
+class GameServer:
+    """
+    Hosts one game per connection over a line protocol: the client sends a command per line
+    and gets back that command's output followed by PROMPT. Long commands run in slices of
+    `slice_time` seconds so that they don't hold up other sessions. Every `sweep_interval`
+    seconds, the sessions that have been idle for `idle_timeout` seconds are evicted from the
+    session table and their connections closed.
+    """
+
+    def __init__(self, idle_timeout=300, slice_time=0.002, sweep_interval=None):
+        self.idle_timeout = idle_timeout
+        self.slice_time = slice_time
+        self.sweep_interval = idle_timeout / 4 if sweep_interval is None else sweep_interval
+        self.sessions = {}
+        self.ids = itertools.count(1)
+        self.num_commands = 0
+
+    async def handle(self, reader, writer):
+        session = Session(next(self.ids), writer)
+        self.sessions[session.id] = session
+        try:
+            await self.send(writer, session)
+            while True:
+                # Eviction closes the connection, which ends the stream here
+                line = await reader.readline()
+                if not line:
+                    break
+
+                session.last_active = time.monotonic()
+                await self.run_command(session, line.decode(errors="replace"))
+                await self.send(writer, session)
+                session.last_active = time.monotonic()
+        except ConnectionError:
+            pass
+        finally:
+            self.sessions.pop(session.id, None)
+            writer.close()
+
+    async def evict_idle_sessions(self):
+        while True:
+            await asyncio.sleep(self.sweep_interval)
+            idle_since = time.monotonic() - self.idle_timeout
+            for session in list(self.sessions.values()):
+                if session.last_active <= idle_since:
+                    del self.sessions[session.id]
+                    session.writer.close()
+
+    async def run_command(self, session, command):
+        self.num_commands += 1
+        continuation = session.game.run_command(command, max_time=self.slice_time)
+        while continuation is not None:
+            # Let other sessions run before the next slice
+            await asyncio.sleep(0)
+            continuation = continuation.resume(max_time=self.slice_time)
+
+    async def send(self, writer, session):
+        writer.write(session.game.get_current_output().encode() + PROMPT)
+        await writer.drain()
+
+    async def serve(self, host="127.0.0.1", port=8023):
+        server = await asyncio.start_server(self.handle, host, port)
+        sweeper = asyncio.create_task(self.evict_idle_sessions())
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            sweeper.cancel()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Host adventure games over TCP.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8023)
+    parser.add_argument("--idle-timeout", type=float, default=300)
+    parser.add_argument("--slice-time", type=float, default=0.002)
+    parser.add_argument("--sweep-interval", type=float)
+    args = parser.parse_args()
+
+    server = GameServer(args.idle_timeout, args.slice_time, args.sweep_interval)
+    asyncio.run(server.serve(args.host, args.port))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+from collections import namedtuple
+
+from adventure import normalize_command
+from routes import ROUTE_LETTERS, ROUTES
+
+# A winning script in three steps, as in the video. Step 1 writes a blackboard for every
+# letter it types, step 2 reads them so that they press step 1's letters and append a program
+# to the hub's blackboard that presses step 2's letters, and step 3 reads the final blackboard,
+# which runs the hub's blackboard and then presses step 3's letters. `boards` maps each letter
+# to the room of its blackboard.
+Solution = namedtuple("Solution", ["step_1", "step_2", "step_3", "hub_board", "hub", "boards"])
+
+
+def letters(commands):
+    return "".join(normalize_command(command) for command in commands)
+
+
+def press_program(start, target, end=None):
+    """
+    Returns the moves and presses that press the buttons for the letters in `target` in order,
+    starting in room `start` and then going to room `end` if there is one.
+    """
+    program = []
+    room = start
+    for letter in target:
+        program += ROUTES[room, letter.upper()]
+        program.append("p")
+        room = letter.upper()
+    if end is not None:
+        program += ROUTES[room, end]
+    return program
+
+
+def board_program(letter, room, hub):
+    # Presses the button for `letter`, then appends a program to the hub's blackboard that
+    # presses the letters typed in step 2 to come and read this blackboard in `room`
+    appended = press_program(hub, ROUTE_LETTERS[hub, room] + "r", hub)
+    press = press_program(room, letter, hub)
+    return [*press, "a", *appended]
+
+
+def final_program(start, hub):
+    return [*ROUTES[start, hub], "r", *press_program(hub, ROUTE_LETTERS[hub, start] + "r")]
+
+
+def plan_tour(start, stops, end):
+    """
+    Returns the order to visit the rooms in `stops` on the way from `start` to `end` that
+    types the fewest letters, keeping the cheapest way to visit each set of stops and end
+    at each of them.
+    """
+    stops = sorted(stops)
+    full = (1 << len(stops)) - 1
+    # (stops visited, last room) -> (letters typed, order)
+    tours = {(0, start): (0, ())}
+    for mask in range(full + 1):
+        for last in [start, *stops]:
+            if (mask, last) not in tours:
+                continue
+            cost, order = tours[mask, last]
+            for i, stop in enumerate(stops):
+                if mask & 1 << i:
+                    continue
+                key = (mask | 1 << i, stop)
+                new_cost = cost + len(ROUTE_LETTERS[last, stop])
+                if key not in tours or new_cost < tours[key][0]:
+                    tours[key] = (new_cost, order + (stop,))
+
+    costs = {
+        order: cost + len(ROUTE_LETTERS[last, end])
+        for (mask, last), (cost, order) in tours.items()
+        if mask == full
+    }
+    return min(costs, key=costs.get)
+
+
+def plan_step_1(start, hub, boards):
+    # Writes the final blackboard, then every letter's blackboard in the order that types the
+    # fewest letters moving between them, ending up in the hub
+    rooms = {room: letter for letter, room in boards.items()}
+    order = [rooms[room] for room in plan_tour(start, rooms, hub)]
+    commands = ["a " + " ".join(final_program(start, hub))]
+    room = start
+    for letter in order:
+        commands += ROUTES[room, boards[letter]]
+        commands.append("a " + " ".join(board_program(letter, boards[letter], hub)))
+        room = boards[letter]
+    commands += ROUTES[room, hub]
+    return commands
+
+
+def generate_solution(start="H", hub="G", boards=None, step_1=None):
+    """
+    Builds a winning script for a game that starts in room `start`, using `hub` for the
+    blackboard that collects step 2's presses. `boards` maps letters to the room of the
+    blackboard that presses them, which is the letter's own room for any letter it leaves
+    out. `step_1` replaces the generated step 1 with commands that write the same blackboards.
+    """
+    boards = dict(boards or {})
+    if step_1 is None:
+        while True:
+            step_1 = plan_step_1(start, hub, boards)
+            needed = set(letters(step_1)) - set(boards)
+            if not needed:
+                break
+            boards.update((letter, letter.upper()) for letter in needed)
+    for letter in set(letters(step_1)) - set(boards):
+        boards[letter] = letter.upper()
+
+    rooms = list(boards.values())
+    if start in rooms or hub in rooms or len(set(rooms)) < len(rooms):
+        raise ValueError(f"Blackboards {boards} overlap with each other, {start} or {hub}")
+
+    step_2 = []
+    hub_board = []
+    for letter in letters(step_1):
+        room = boards[letter]
+        step_2 += [*ROUTES[hub, room], "r"]
+        hub_board += press_program(hub, ROUTE_LETTERS[hub, room] + "r", hub)
+    step_3 = [*ROUTES[hub, start], "r"]
+    return Solution(step_1, step_2, step_3, " ".join(hub_board), hub, boards)
+
+
+def full_script(solution):
+    return solution.step_1 + solution.step_2 + solution.step_3
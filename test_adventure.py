@@ -0,0 +1,189 @@
+import random
+
+import pytest
+
+import adventure
+from adventure import AdventureGame
+from read_cache import ReadCache
+
+DIRECTIONS = ["e", "w", "ne", "nw", "se", "sw"]
+
+
+def random_line(rng, depth=0):
+    words = []
+    for _ in range(rng.randint(0, 8)):
+        x = rng.random()
+        if x < 0.45:
+            words.append(rng.choice(DIRECTIONS))
+        elif x < 0.55:
+            words.append("r")
+        elif x < 0.6:
+            words.append("p")
+        elif x < 0.63:
+            words.append(rng.choice("ijdlkv"))
+        elif x < 0.64:
+            words.append(rng.choice(["b", "n", "s", "nn", "sx", "q"]))
+        elif depth < 2 and x < 0.8:
+            # Writing ends the line
+            words.append(rng.choice("ta") + " " + random_line(rng, depth + 1))
+            break
+        else:
+            words.append(rng.choice(DIRECTIONS))
+    return " ".join(words)
+
+
+def random_script(rng):
+    script = [random_line(rng) for _ in range(rng.randint(1, 40))]
+    if rng.random() < 0.5:
+        # A blackboard that may read itself, in its room or after moving around
+        words = [rng.choice(DIRECTIONS + ["x", "p", "v"]) for _ in range(rng.randint(0, 3))]
+        words.insert(rng.randint(0, len(words)), "r")
+        if rng.random() < 0.5:
+            words.append("r")
+        position = rng.randint(0, len(script))
+        script[position:position] = ["t " + " ".join(words), "r"]
+    return script
+
+
+def play(script, make_game=AdventureGame):
+    """
+    Returns the output of every command in `script` and everything about the game's state
+    afterwards that the player can tell apart.
+    """
+    game = make_game()
+    outputs = [game.get_current_output()]
+    for command in script:
+        game.run_command(command)
+        outputs.append(game.get_current_output())
+    state = game.state
+    return outputs, (
+        state.location,
+        state.log1,
+        state.log2,
+        dict(state.blackboards),
+        state.running,
+        state.won,
+        state.num_commands,
+        state.verbose,
+    )
+
+
+@pytest.fixture
+def small_limits(monkeypatch):
+    # Lets random scripts run into every limit quickly
+    monkeypatch.setattr(adventure, "MAX_COMMANDS", 3000)
+    monkeypatch.setattr(adventure, "MAX_BLACKBOARD_LENGTH", 120)
+    monkeypatch.setattr(adventure, "MAX_DEPTH", 12)
+
+
+SCRIPTS = [
+    ["t r", "r"],
+    ["t e w r", "r"],
+    ["t e r", "w", "r", "k"],
+    ["e", "t x", "w", "t e r w r", "r"],
+    ["t eé", "a ß", "d", "a αβ", "d", "r", "k"],
+    adventure.SAMPLE_SOLUTION,
+    adventure.SAMPLE_SOLUTION[:-1] + ["ne r"],
+]
+
+
+@pytest.mark.parametrize("script", SCRIPTS)
+def test_cycle_detection_matches_plain_interpreter(script):
+    assert play(script, lambda: AdventureGame(detect_cycles=True)) == play(script)
+
+
+def test_skipped_cycles_keep_their_output():
+    script = ["e", "t x", "w", "t e r w r", "r"]
+    outputs, _ = play(script, lambda: AdventureGame(detect_cycles=True))
+    assert outputs[-1].count("Invalid command.") == 999
+
+
+@pytest.mark.parametrize("seed", range(4))
+def test_cycle_detection_matches_plain_interpreter_on_random_scripts(small_limits, seed):
+    rng = random.Random(seed)
+    for _ in range(100):
+        script = random_script(rng)
+        assert play(script, lambda: AdventureGame(detect_cycles=True)) == play(script), script
+
+
+@pytest.mark.parametrize("script", SCRIPTS)
+def test_read_cache_matches_plain_interpreter(script):
+    cache = ReadCache()
+    assert play(script, lambda: AdventureGame(read_cache=cache)) == play(script)
+    # Again with the summaries from the first run
+    assert play(script, lambda: AdventureGame(read_cache=cache)) == play(script)
+
+
+@pytest.mark.parametrize("seed", range(4))
+def test_read_cache_matches_plain_interpreter_on_random_scripts(small_limits, seed):
+    rng = random.Random(seed)
+    # One cache for every game, as in a server
+    cache = ReadCache()
+    for _ in range(100):
+        script = random_script(rng)
+        # Reads that aren't verbose mostly go through transitions instead of the cache
+        for script in (script, ["v", *script]):
+            for detect_cycles in (False, True):
+
+                def make_game():
+                    return AdventureGame(read_cache=cache, detect_cycles=detect_cycles)
+
+                assert play(script, make_game) == play(script), script
+    assert cache.hits > 0
+
+
+class SlicedGame(AdventureGame):
+    """Runs every command in slices of random sizes, some of them timed."""
+
+    def __init__(self, rng, **kwargs):
+        super().__init__(**kwargs)
+        self.rng = rng
+
+    def run_command(self, command):
+        continuation = super().run_command(command, max_commands=self.rng.choice([0, 1, 7, 400]))
+        while continuation is not None:
+            if self.rng.random() < 0.3:
+                continuation = continuation.resume(max_time=0.00001)
+            else:
+                continuation = continuation.resume(max_commands=self.rng.choice([0, 1, 3, 100]))
+
+
+@pytest.mark.parametrize("script", SCRIPTS)
+def test_slicing_matches_plain_interpreter(script):
+    rng = random.Random(0)
+    assert play(script, lambda: SlicedGame(rng)) == play(script)
+
+
+@pytest.mark.parametrize("seed", range(4))
+def test_slicing_matches_plain_interpreter_on_random_scripts(small_limits, seed):
+    rng = random.Random(seed)
+    for _ in range(100):
+        script = random_script(rng)
+        for options in ({}, {"detect_cycles": True}, {"read_cache": ReadCache()}):
+            assert play(script, lambda: SlicedGame(rng, **options)) == play(script), script
+
+
+def test_paused_commands_must_finish_first():
+    game = AdventureGame()
+    game.run_command("t j e w r")
+    snapshot = game.snapshot()
+    continuation = game.run_command("r", max_commands=10)
+    for action in (
+        lambda: game.run_command("e"),
+        lambda: game.run_commands(["e"], final_only=True),
+        game.snapshot,
+        game.fork,
+        lambda: game.restore(snapshot),
+    ):
+        with pytest.raises(RuntimeError):
+            action()
+
+    while continuation is not None:
+        continuation = continuation.resume(max_commands=100)
+    plain = AdventureGame()
+    plain.run_command("t j e w r")
+    plain.run_command("r")
+    assert game.get_current_output() == plain.get_current_output()
+    assert game.state.num_commands == plain.state.num_commands
+    with pytest.raises(RuntimeError):
+        game.resume()
@@ -0,0 +1,75 @@
+import random
+
+from adventure import AdventureGame, text_hash
+from transposition import TranspositionTable
+
+
+def swap(text, i, j):
+    letters = list(text)
+    letters[i], letters[j] = letters[j], letters[i]
+    return "".join(letters)
+
+
+def test_swapped_texts_hash_differently():
+    rng = random.Random(0)
+    text = "".join(rng.choice("abcdefghijklmnopqrstuvwxyz") for _ in range(500))
+    for distance in range(1, 200):
+        i = rng.randrange(len(text) - distance)
+        swapped = swap(text, i, i + distance)
+        if swapped != text:
+            assert text_hash(swapped) != text_hash(text), distance
+
+
+def test_swapped_logs_hash_differently():
+    game = AdventureGame()
+    game.run_command("x" + "z" * 60 + "y")
+    other = AdventureGame()
+    other.run_command("y" + "z" * 60 + "x")
+    assert game.state.log1 != other.state.log1
+    assert game.state_hash() != other.state_hash()
+
+    table = TranspositionTable()
+    assert table.visit(game.state)
+    assert table.visit(other.state)
+    assert not table.visit(game.fork().state)
+
+
+def test_swapped_blackboards_hash_differently():
+    rng = random.Random(1)
+    text = "".join(rng.choice("nesw") for _ in range(500))
+    i = next(i for i in range(len(text) - 61) if text[i] != text[i + 61])
+    game = AdventureGame()
+    game.run_command("a " + text)
+    other = AdventureGame()
+    other.run_command("a " + swap(text, i, i + 61))
+    assert game.state.blackboards["H"] != other.state.blackboards["H"]
+    assert game.state_hash() != other.state_hash()
+
+
+def test_incremental_hashes_match_fresh_ones():
+    game = AdventureGame()
+    commands = ["a wrwwnwpep", "se", "a pnww", "d", "d", "a ee", "e", "x" * 3000]
+    for command in commands:
+        game.run_command(command)
+        game.state_hash()
+        fresh = AdventureGame()
+        fresh.restore(game.snapshot())
+        fresh.state.boards = [type(board)(board.text) for board in fresh.state.boards]
+        fresh.state.log1_hash = fresh.state.log1_hashed = 0
+        assert fresh.state_hash() == game.state_hash()
+
+
+def test_snapshots_keep_the_log1_hash():
+    game = AdventureGame()
+    game.run_command("x" * 1000)
+    before = game.state_hash()
+    snapshot = game.snapshot()
+    fork = game.fork()
+    assert fork.state.log1_hashed == len(fork.state.log1)
+    assert fork.state_hash() == before
+
+    game.run_command("ee")
+    assert game.state_hash() != before
+    game.restore(snapshot)
+    assert game.state.log1_hashed == len(game.state.log1)
+    assert game.state_hash() == before
@@ -0,0 +1,53 @@
+from collections import OrderedDict
+
+
+class TranspositionTable:
+    """
+    An LRU table of the game states a search has seen, keyed on GameState.state_hash(), with
+    an optional value for each (such as the best cost found to reach it). Once it holds
+    `max_size` states it forgets the least recently seen.
+    """
+
+    def __init__(self, max_size=1 << 20):
+        self.max_size = max_size
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __contains__(self, key):
+        return key in self.entries
+
+    def get(self, key, default=None):
+        if key not in self.entries:
+            self.misses += 1
+            return default
+
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return self.entries[key]
+
+    def put(self, key, value=None):
+        self.entries[key] = value
+        self.entries.move_to_end(key)
+        if len(self.entries) > self.max_size:
+            self.entries.popitem(last=False)
+
+    def visit(self, state, value=None):
+        """
+        Records `state` and returns True, or returns False if it has been seen already.
+        """
+        key = state.state_hash()
+        if key in self.entries:
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return False
+
+        self.misses += 1
+        self.put(key, value)
+        return True
+
+    def clear(self):
+        self.entries.clear()
@@ -0,0 +1,190 @@
+import re
+
+import numpy as np
+
+import adventure
+from adventure import (
+    FINAL_OPS,
+    NEIGHBOR_IDS,
+    OP_APPEND,
+    OP_IF_NOT_EMPTY,
+    OP_MOVE,
+    OP_PRESS,
+    OP_QUIT,
+    OP_VERBOSE,
+    OP_WRITE,
+    PRESS_LETTERS,
+    ROOMS,
+    AdventureGame,
+    compile_program,
+    normalize_command,
+)
+from batch import ScriptResult
+from output import NullSink
+
+# What each step of a game does, once everything that only affects the output is dropped
+STEP_END, STEP_NOTHING, STEP_MOVE, STEP_PRESS, STEP_QUIT = range(5)
+
+STEPS = np.full(256, STEP_NOTHING, dtype=np.int8)
+STEPS[[OP_MOVE, OP_PRESS, OP_QUIT]] = [STEP_MOVE, STEP_PRESS, STEP_QUIT]
+
+NEIGHBOR_ARRAY = np.array(NEIGHBOR_IDS, dtype=np.int64)
+PRESS_CODES = np.array([ord(letter) for letter in PRESS_LETTERS], dtype=np.int64)
+
+# The pieces compile_program splits a line into, with "|" ending each line
+TOKEN = re.compile(r"\||ne|nw|se|sw|[ns](?=\|)|[ns].|.")
+SEPARATOR = 255
+
+
+def compile_scripts(lines):
+    """
+    Compiles every game's lines (already normalized) into rows of steps, up to the first
+    line that writes on a blackboard. Until then every board is empty, so reads, erases and
+    the checks for an empty board don't change anything either. Returns the steps, their
+    arguments, the length of log1 while each step runs, and for each game how many lines
+    its steps cover and how many times they toggle verbose mode.
+    """
+    num_games = len(lines)
+    script_lengths = np.array([len(script) for script in lines], dtype=np.int64)
+    line_games = np.repeat(np.arange(num_games), script_lengths)
+    first_lines = np.cumsum(script_lengths) - script_lengths
+    line_lengths = np.array([len(line) for script in lines for line in script], dtype=np.int64)
+    log1_lengths = np.cumsum(line_lengths)
+    log1_lengths -= (log1_lengths - line_lengths)[first_lines[line_games]]
+
+    # Tokens have at most two letters, so pack each into one integer and look up each
+    # distinct token's opcode once
+    tokens = TOKEN.findall("".join(line + "|" for script in lines for line in script))
+    letters = np.array(tokens, dtype="U2").view(np.uint32).reshape(-1, 2).astype(np.int64)
+    keys, token_ids = np.unique(letters[:, 0] << 21 | letters[:, 1], return_inverse=True)
+    distinct = [chr(key >> 21) + (chr(key & 0x1FFFFF) if key & 0x1FFFFF else "") for key in keys]
+    programs = [compile_program(token) for token in distinct]
+    token_ops = np.array([program.ops[0] for program in programs], dtype=np.int64)
+    token_args = np.array([program.args[0] for program in programs], dtype=np.int64)
+    token_ops[[token == "|" for token in distinct]] = SEPARATOR
+    ops = token_ops[token_ids.reshape(-1)]
+    args = token_args[token_ids.reshape(-1)]
+
+    # Lines stop after the first opcode that ends them
+    separators = ops == SEPARATOR
+    token_lines = np.cumsum(separators) - separators
+    final = np.isin(ops, list(FINAL_OPS | {OP_IF_NOT_EMPTY}))
+    finals_before = np.cumsum(final) - final
+    line_starts = np.concatenate(([0], np.flatnonzero(separators) + 1))[:-1].astype(np.int64)
+    keep = ~separators & (finals_before == finals_before[line_starts][token_lines])
+
+    # Games stop at the first line that writes
+    writes = np.flatnonzero(keep & np.isin(ops, [OP_WRITE, OP_APPEND]))
+    handoffs = first_lines + script_lengths
+    np.minimum.at(handoffs, line_games[token_lines[writes]], token_lines[writes])
+    keep &= token_lines < handoffs[line_games[token_lines]]
+
+    kept = np.flatnonzero(keep)
+    games = line_games[token_lines[kept]]
+    counts = np.bincount(games, minlength=num_games)
+    positions = np.arange(len(kept)) - (np.cumsum(counts) - counts)[games]
+    num_steps = int(counts.max(initial=0))
+
+    steps = np.full((num_games, num_steps), STEP_END, dtype=np.int8)
+    step_args = np.zeros((num_games, num_steps), dtype=np.int8)
+    step_log1_lengths = np.zeros((num_games, num_steps), dtype=np.int64)
+    steps[games, positions] = STEPS[ops[kept]]
+    step_args[games, positions] = args[kept]
+    step_log1_lengths[games, positions] = log1_lengths[token_lines[kept]]
+    toggles = np.bincount(games, weights=ops[kept] == OP_VERBOSE, minlength=num_games)
+    return steps, step_args, step_log1_lengths, handoffs - first_lines, toggles.astype(np.int64)
+
+
+def run_vectorized(scripts):
+    """
+    Plays many scripts at once and returns a ScriptResult (without output) for each. The
+    games advance in lockstep as NumPy arrays for as long as they only move and press;
+    any game that writes on a blackboard carries on from there in a regular GameState.
+    """
+    lines = [[normalize_command(command) for command in script] for script in scripts]
+    steps, args, log1_lengths, num_lines, toggles = compile_scripts(lines)
+    num_games, num_steps = steps.shape
+
+    # log1 as bytes; letters that aren't ASCII can never be pressed, so they all become 0
+    log1_width = max((sum(map(len, script)) for script in lines), default=0) + 1
+    log1 = np.zeros((num_games, log1_width), dtype=np.uint8)
+    for game, script in enumerate(lines):
+        text = "".join(script).encode("ascii", "replace").replace(b"?", b"\0")
+        log1[game, : len(text)] = np.frombuffer(text, dtype=np.uint8)
+
+    rooms = np.full(num_games, adventure.ROOM_IDS["H"], dtype=np.int64)
+    matches = np.zeros(num_games, dtype=np.int64)
+    num_commands = np.zeros(num_games, dtype=np.int64)
+    running = np.ones(num_games, dtype=bool)
+    won = np.zeros(num_games, dtype=bool)
+    failed = np.zeros(num_games, dtype=bool)
+
+    for step in range(num_steps):
+        kind = steps[:, step]
+        active = running & (kind != STEP_END)
+        if not active.any():
+            break
+
+        num_commands += active
+        starved = active & (num_commands > adventure.MAX_COMMANDS)
+        running &= ~starved
+        active &= ~starved
+
+        moving = active & (kind == STEP_MOVE)
+        targets = NEIGHBOR_ARRAY[rooms * 6 + args[:, step]]
+        rooms = np.where(moving & (targets >= 0), targets, rooms)
+
+        pressing = np.flatnonzero(active & (kind == STEP_PRESS))
+        if len(pressing):
+            match = matches[pressing]
+            length = log1_lengths[pressing, step]
+            expected = log1[pressing, np.minimum(match, log1_width - 1)]
+            correct = (match < length) & (expected == PRESS_CODES[rooms[pressing]])
+            matches[pressing] = match + correct
+            won[pressing] = correct & (match + 1 == length)
+            failed[pressing] = ~correct
+            running[pressing] &= correct & ~won[pressing]
+
+        running &= ~(active & (kind == STEP_QUIT))
+
+    results = []
+    for game, script in enumerate(lines):
+        if running[game] and num_lines[game] < len(script):
+            state = (rooms[game], matches[game], num_commands[game], toggles[game])
+            results.append(finish_game(script, num_lines[game], *state))
+        else:
+            results.append(
+                ScriptResult(
+                    bool(won[game]),
+                    bool(running[game]),
+                    int(num_commands[game]),
+                    ROOMS[rooms[game]],
+                    int(matches[game] + failed[game]),
+                    None,
+                )
+            )
+    return results
+
+
+def finish_game(lines, num_lines, room, match, num_commands, toggles):
+    # Picks up a game in a GameState at the first line that writes on a blackboard
+    scalar = AdventureGame(output=NullSink(), detect_cycles=True)
+    state = scalar.state
+    state.room = int(room)
+    state.log1 = "".join(lines[:num_lines])
+    state.log2_match = int(match)
+    state.num_commands = int(num_commands)
+    state.verbose = adventure.DEBUG ^ (toggles % 2 == 1)
+    for line in lines[num_lines:]:
+        if not state.running:
+            break
+        scalar.run_command(line)
+
+    return ScriptResult(
+        state.won,
+        state.running,
+        state.num_commands,
+        state.location,
+        state.log2_match + len(state.log2_extra),
+        None,
+    )